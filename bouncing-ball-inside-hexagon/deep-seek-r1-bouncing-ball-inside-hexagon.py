@@ -1,8 +1,16 @@
-import pygame
 import math
+import sys
+
+# Headless mode: run the same physics with no window or frame limiter (see hexsim/).
+if "--headless" in sys.argv[1:]:
+    from hexsim.cli import main as run_headless
+    sys.exit(run_headless(["--impl", "deep-seek-r1"] + sys.argv[1:]))
+
+import pygame
 from pygame.math import Vector2
+from hexsim.profiler import FrameProfiler  # F3 toggles the timing HUD; --profile-trace PATH saves a trace
 
-pygame.init()
+pygame.display.init()
 
 # Screen settings
 width, height = 800, 600
@@ -48,14 +56,19 @@ def closest_point_on_segment(p, a, b):
     return a + t * ab
 
 
+profiler = FrameProfiler.from_argv(sys.argv[1:])
 running = True
 while running:
+    profiler.start_frame()
     dt = clock.tick(60) / 1000.0  # Delta time in seconds
+    profiler.lap("tick")
 
     # Event handling
     for event in pygame.event.get():
+        profiler.handle_event(event)
         if event.type == pygame.QUIT:
             running = False
+    profiler.lap("events")
 
     # Update hexagon rotation
     current_rotation = pygame.time.get_ticks() * 0.001 * rotation_speed
@@ -64,6 +77,7 @@ while running:
     ball_vel += gravity * dt
     ball_vel *= air_friction ** (dt * 60)  # Adjust air friction for frame rate
     ball_pos += ball_vel * dt
+    profiler.lap("physics")
 
     # Get current hexagon vertices
     vertices = get_hexagon_vertices(center, hex_radius, current_rotation)
@@ -112,6 +126,7 @@ while running:
                 ball_pos += normal * penetration * 1.1
 
                 collision_occurred = True
+    profiler.lap("collision")
 
     # Drawing
     screen.fill(BLACK)
@@ -121,7 +136,11 @@ while running:
 
     # Draw ball
     pygame.draw.circle(screen, RED, (int(ball_pos.x), int(ball_pos.y)), ball_radius)
+    profiler.draw_hud(screen)
+    profiler.lap("draw")
 
     pygame.display.flip()
+    profiler.lap("flip")
 
+profiler.close()
 pygame.quit()
@@ -0,0 +1,26 @@
+"""
+Shared, pygame-free simulation code for the bouncing-ball-in-a-hexagon scripts.
+"""
+from .engine import (
+    IMPLEMENTATIONS,
+    DeepSeekR1,
+    O1,
+    O3Mini,
+    O3MiniHigh,
+    Simulation,
+    WorldState,
+    create,
+    polygon_vertices,
+)
+
+__all__ = [
+    "IMPLEMENTATIONS",
+    "DeepSeekR1",
+    "O1",
+    "O3Mini",
+    "O3MiniHigh",
+    "Simulation",
+    "WorldState",
+    "create",
+    "polygon_vertices",
+]
@@ -0,0 +1,308 @@
+"""
+Streaming analytics for long runs: where the ball spends its time, where it
+hits the walls and how hard, in memory that doesn't grow with run length.
+
+    python -m hexsim.analytics --impl o3-mini-high --hours 24 --export-every 3600 --out stats
+
+:class:`Analytics` keeps:
+
+- 2D occupancy histograms of the ball's center, in the world frame and in the
+  polygon's rotating frame;
+- a histogram of the ball's speed;
+- per edge (numbered as in :meth:`~hexsim.engine.Simulation.vertices`, or
+  as in :attr:`~hexsim.container.MeshContainer.edges` for a container), the
+  number of impacts, the total impulse (the velocity change, per unit mass)
+  and a histogram of impulse sizes.
+
+Each step adds one sample to a fixed-size buffer, which is binned in bulk
+with NumPy when it fills up.  Impacts come from a hook on the simulation's
+``respond()`` -- the response every collision path calls (the scripts'
+``handle_collisions`` / ``collide_ball_with_segment`` ports, the rotating-frame
+kernels and swept mode) -- so they are counted whatever the collision mode.
+The kernels hand ``respond()`` rotating-frame vectors, so an impact is put on
+the edge the ball faces at the next sample, when it is still against that
+wall: the polygon side whose sector it is in, or a container's edge nearest
+its center (a container's edges are not equal sectors).
+
+:meth:`Analytics.snapshot` returns copies of all histograms at any time,
+:meth:`Analytics.save` writes them to a ``.npz`` file and :func:`heatmap`
+renders an occupancy histogram with Pillow.
+"""
+import argparse
+import math
+import time
+from array import array
+
+import numpy as np
+
+from .engine import IMPLEMENTATIONS, Simulation, create
+
+
+class Analytics:
+    """
+    Incremental statistics for 'sim'; call :meth:`sample` after every step
+    (or use :meth:`run`).  The hook is installed right away; :meth:`detach`
+    removes it.
+
+    The occupancy histograms have 'bins' x 'bins' cells over the polygon's
+    bounding square.  Speeds at or above 'max_speed' and impulses at or above
+    'max_impulse' fall into the last bin.  'buffer' is the number of samples
+    held before they are binned.
+    """
+
+    def __init__(self, sim, bins=64, speed_bins=64, max_speed=1500.0, impulse_bins=32, max_impulse=1500.0,
+                 buffer=4096):
+        self.sim = sim
+        self.bins = bins
+        self.speed_bins = speed_bins
+        self.max_speed = max_speed
+        self.impulse_bins = impulse_bins
+        self.max_impulse = max_impulse
+        self.extent = sim.hex_radius + sim.ball_radius
+        self.sides = sim.sides
+        container = sim.container
+        self._walls = None if container is None else np.array([edge[:5] for edge in container.edges]).T
+
+        self.world = np.zeros((bins, bins), np.int64)  # indexed [x bin, y bin]
+        self.rotating = np.zeros((bins, bins), np.int64)
+        self.speed = np.zeros(speed_bins, np.int64)
+        self.impacts = np.zeros(self.sides, np.int64)
+        self.impulse_total = np.zeros(self.sides)
+        self.impulse = np.zeros((self.sides, impulse_bins), np.int64)
+        self.samples = 0
+        self.outside = 0  # samples that fell outside the histogram's square
+
+        self.buffer = buffer
+        self._x, self._y, self._angle, self._speed = (array("d", bytes(8 * buffer)) for _ in range(4))
+        self._edge = array("l", bytes(array("l").itemsize * buffer))
+        self._kick = array("d", bytes(8 * buffer))
+        self._pending = 0
+        self._pending_impacts = 0
+        self._assigned = 0
+        self.attach()
+
+    def attach(self):
+        """Install the impact hook on the simulation's ``respond``."""
+        sim = self.sim
+        respond = type(sim).respond.__get__(sim)
+
+        def observed(vx, vy, px, py, nx, ny):
+            new_vx, new_vy, bounced = respond(vx, vy, px, py, nx, ny)
+            if bounced:
+                self._impact(math.hypot(new_vx - vx, new_vy - vy))
+            return new_vx, new_vy, bounced
+
+        sim.respond = observed
+
+    def detach(self):
+        """Remove the hook (binning anything still buffered)."""
+        self.flush()
+        self.sim.__dict__.pop("respond", None)
+
+    def _impact(self, impulse):
+        k = self._pending_impacts
+        if k == self.buffer:
+            self._assign_edges()
+            self._flush_impacts()
+            k = 0
+        self._kick[k] = impulse
+        self._pending_impacts = k + 1
+
+    def _assign_edges(self):
+        """Put the impacts not yet placed on the edge the ball faces now."""
+        sim = self.sim
+        if self._walls is None:
+            angle = math.atan2(sim.y - sim.cy, sim.x - sim.cx) - sim.angle
+            edge = math.floor(angle * self.sides / (2 * math.pi)) % self.sides
+        else:
+            edge = self._nearest_wall()
+        for k in range(self._assigned, self._pending_impacts):
+            self._edge[k] = edge
+        self._assigned = self._pending_impacts
+
+    def _nearest_wall(self):
+        """Index of the container edge nearest the ball's center."""
+        sim = self.sim
+        dx, dy = sim.x - sim.cx, sim.y - sim.cy
+        c, s = math.cos(sim.angle), math.sin(sim.angle)
+        lx, ly = c * dx + s * dy, c * dy - s * dx
+        ax, ay, abx, aby, inv_length_sq = self._walls
+        t = np.clip(((lx - ax) * abx + (ly - ay) * aby) * inv_length_sq, 0.0, 1.0)
+        return int(np.argmin((lx - ax - t * abx) ** 2 + (ly - ay - t * aby) ** 2))
+
+    def sample(self):
+        """Record the current state as one sample; call it after every step."""
+        sim = self.sim
+        if self._pending_impacts != self._assigned:
+            self._assign_edges()
+        k = self._pending
+        self._x[k] = sim.x
+        self._y[k] = sim.y
+        self._angle[k] = sim.angle
+        self._speed[k] = math.sqrt(sim.vx * sim.vx + sim.vy * sim.vy)
+        self._pending = k + 1
+        if k + 1 == self.buffer:
+            self._flush_samples()
+
+    def run(self, steps, dt):
+        """Step the simulation 'steps' times, sampling after each step; returns self."""
+        step, sample = self.sim.step, self.sample
+        for _ in range(steps):
+            step(dt)
+            sample()
+        return self
+
+    def _bin(self, values, low, high, bins):
+        """Bin indices of 'values' over [low, high), or -1 outside."""
+        index = np.floor((values - low) * (bins / (high - low))).astype(np.int64)
+        index[(index < 0) | (index >= bins)] = -1
+        return index
+
+    def _flush_samples(self):
+        n = self._pending
+        if not n:
+            return
+        sim, bins, extent = self.sim, self.bins, self.extent
+        x = np.frombuffer(self._x, count=n) - sim.cx
+        y = np.frombuffer(self._y, count=n) - sim.cy
+        angle = np.frombuffer(self._angle, count=n)
+        c, s = np.cos(angle), np.sin(angle)
+        for hist, hx, hy in ((self.world, x, y), (self.rotating, c * x + s * y, c * y - s * x)):
+            ix, iy = self._bin(hx, -extent, extent, bins), self._bin(hy, -extent, extent, bins)
+            inside = (ix >= 0) & (iy >= 0)
+            hist += np.bincount(ix[inside] * bins + iy[inside], minlength=bins * bins).reshape(bins, bins)
+            if hist is self.world:
+                self.outside += int(n - inside.sum())
+
+        speed = np.frombuffer(self._speed, count=n)
+        index = np.minimum((speed * (self.speed_bins / self.max_speed)).astype(np.int64), self.speed_bins - 1)
+        self.speed += np.bincount(index, minlength=self.speed_bins)
+        self.samples += n
+        self._pending = 0
+
+    def _flush_impacts(self):
+        n = self._pending_impacts
+        if not n:
+            return
+        edge = np.frombuffer(self._edge, dtype=np.dtype(self._edge.typecode), count=n).astype(np.int64)
+        kick = np.frombuffer(self._kick, count=n)
+        self.impacts += np.bincount(edge, minlength=self.sides)
+        self.impulse_total += np.bincount(edge, weights=kick, minlength=self.sides)
+        index = np.minimum((kick * (self.impulse_bins / self.max_impulse)).astype(np.int64), self.impulse_bins - 1)
+        self.impulse += np.bincount(edge * self.impulse_bins + index,
+                                    minlength=self.sides * self.impulse_bins).reshape(self.sides, self.impulse_bins)
+        self._pending_impacts = self._assigned = 0
+
+    def flush(self):
+        """Bin everything buffered so far."""
+        self._assign_edges()
+        self._flush_samples()
+        self._flush_impacts()
+
+    def snapshot(self):
+        """Copies of all statistics so far, as a dict of arrays and numbers."""
+        self.flush()
+        return {
+            "time": self.sim.time,
+            "samples": self.samples,
+            "outside": self.outside,
+            "extent": self.extent,
+            "world": self.world.copy(),
+            "rotating": self.rotating.copy(),
+            "speed": self.speed.copy(),
+            "speed_edges": np.linspace(0.0, self.max_speed, self.speed_bins + 1),
+            "impacts": self.impacts.copy(),
+            "impulse_total": self.impulse_total.copy(),
+            "impulse": self.impulse.copy(),
+            "impulse_edges": np.linspace(0.0, self.max_impulse, self.impulse_bins + 1),
+        }
+
+    def save(self, path):
+        """Write :meth:`snapshot` to the ``.npz`` file 'path'."""
+        np.savez_compressed(path, **self.snapshot())
+
+    def summary(self):
+        snap = self.snapshot()
+        counts = snap["speed"]
+        cumulative = np.cumsum(counts)
+        mids = 0.5 * (snap["speed_edges"][:-1] + snap["speed_edges"][1:])
+        total = int(cumulative[-1])
+        impacts = snap["impacts"]
+
+        def speed_percentile(fraction):
+            # None until there is a sample to rank.
+            if not total:
+                return None
+            return float(mids[min(np.searchsorted(cumulative, fraction * total), len(mids) - 1)])
+
+        return {
+            "time": snap["time"],
+            "samples": snap["samples"],
+            "impacts": int(impacts.sum()),
+            "busiest_edge": int(np.argmax(impacts)),
+            "edge_share": (impacts / max(int(impacts.sum()), 1)).round(3).tolist(),
+            "mean_impulse": float(snap["impulse_total"].sum() / max(int(impacts.sum()), 1)),
+            "speed_p50": speed_percentile(0.5),
+            "speed_p99": speed_percentile(0.99),
+        }
+
+
+def heatmap(hist, scale=4):
+    """An occupancy histogram as a log-scaled Pillow image (x to the right, y down)."""
+    from PIL import Image
+
+    values = np.log1p(hist.T.astype(float))
+    top = values.max() or 1.0
+    pixels = (255 * values / top).astype(np.uint8)
+    image = Image.fromarray(pixels, "L")
+    return image.resize((image.width * scale, image.height * scale), Image.NEAREST)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.analytics",
+                                     description="Run headlessly with streaming occupancy and impact statistics.")
+    parser.add_argument("--impl", choices=sorted(IMPLEMENTATIONS), default="o3-mini-high")
+    parser.add_argument("--collision", choices=list(Simulation.COLLISION_MODES), default="discrete")
+    parser.add_argument("--hours", type=float, default=1.0, help="simulated hours")
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--bins", type=int, default=64)
+    parser.add_argument("--export-every", type=float, default=0.0, metavar="SECONDS",
+                        help="also export a snapshot every this many simulated seconds")
+    parser.add_argument("--out", default="analytics",
+                        help="prefix for the exported .npz files and heatmap PNGs")
+    parser.add_argument("--png", action="store_true", help="also write world/rotating-frame heatmap PNGs")
+    args = parser.parse_args(argv)
+
+    sim = create(args.impl, collision=args.collision)
+    stats = Analytics(sim, bins=args.bins)
+    total = round(args.hours * 3600 / args.dt)
+    chunk = round(args.export_every / args.dt) if args.export_every > 0 else total
+    start = time.perf_counter()
+    done = exports = 0
+    while done < total:
+        steps = min(chunk, total - done)
+        stats.run(steps, args.dt)
+        done += steps
+        if args.export_every > 0 and done < total:
+            exports += 1
+            stats.save(f"{args.out}-{exports:04d}.npz")
+    elapsed = time.perf_counter() - start
+
+    stats.save(f"{args.out}.npz")
+    if args.png:
+        snap = stats.snapshot()
+        for frame in ("world", "rotating"):
+            heatmap(snap[frame]).save(f"{args.out}-{frame}.png")
+    summary = stats.summary()
+    print(f"{args.impl}: {summary['time']:.0f} s simulated in {elapsed:.2f} s wall, {summary['samples']} samples, "
+          f"{exports} intermediate exports")
+    print(f"  impacts {summary['impacts']}, mean impulse {summary['mean_impulse']:.1f} px/s, "
+          f"busiest edge {summary['busiest_edge']}; share per edge {summary['edge_share']}")
+    if summary["samples"]:
+        print(f"  speed median {summary['speed_p50']:.0f} px/s, p99 {summary['speed_p99']:.0f} px/s")
+    print(f"wrote {args.out}.npz")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
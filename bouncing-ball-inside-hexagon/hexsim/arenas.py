@@ -0,0 +1,280 @@
+"""
+Thousands of independent arenas -- each with its own spin, gravity,
+restitution, friction and set of balls -- stepped by worker processes over
+shared memory.
+
+    python -m hexsim.arenas --arenas 4000 --balls 8 --workers 4 --steps 3600 \\
+        --range angular_velocity=-3:3 --range gravity=200:800
+
+All state lives in one ``multiprocessing.shared_memory`` block as NumPy
+arrays: per ball the position, velocity, arena index and bounce count; per
+arena the angle and the physics constants.  Balls are stored grouped by
+arena and each worker owns a contiguous shard of arenas, so it steps its
+slice of every array in place.  The orchestrator only sends a worker a tiny
+``(steps, dt)`` command per batch and gets back its elapsed time; results are
+read straight from the shared arrays, so nothing is pickled per step.
+
+Each step is the o3-mini-high physics of :class:`~hexsim.batched.BatchedSimulation`.
+Arenas share their geometry but not their rotation, so every ball is turned
+into its own arena's frame, where all polygons coincide, and
+:func:`~hexsim.batched.collide_with_edges` resolves every ball of the shard
+against that one fixed polygon with per-ball constants.  The response only
+depends on vectors relative to the center, so it is the same in either frame.
+"""
+import argparse
+import math
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .batched import collide_with_edges, polygon_vertices
+from .engine import O3MiniHigh
+from .sweep import parse_range
+
+ARENA_PARAMS = tuple(O3MiniHigh.PARAMS)  # gravity, restitution, friction_coeff, angular_velocity
+
+
+def layout(arenas, balls):
+    """Name -> (dtype, shape, byte offset) of every array in the shared block, and its size."""
+    fields = [
+        ("pos", np.float64, (balls, 2)),
+        ("vel", np.float64, (balls, 2)),
+        ("arena", np.int32, (balls,)),
+        ("hits", np.int64, (balls,)),
+        ("angle", np.float64, (arenas,)),
+        *((name, np.float64, (arenas,)) for name in ARENA_PARAMS),
+    ]
+    result, offset = {}, 0
+    for name, dtype, shape in fields:
+        offset = -(-offset // 8) * 8
+        result[name] = (np.dtype(dtype).str, shape, offset)
+        offset += np.dtype(dtype).itemsize * math.prod(shape)
+    return result, max(offset, 1)
+
+
+def views(buffer, fields):
+    return {name: np.ndarray(shape, dtype, buffer=buffer, offset=offset)
+            for name, (dtype, shape, offset) in fields.items()}
+
+
+class Shard:
+    """
+    One worker's arenas [a0, a1) and their balls [b0, b1), stepped in place.
+    Per-ball copies of the constants are gathered once.
+    """
+
+    def __init__(self, arrays, arenas, balls, geometry):
+        a0, a1 = arenas
+        b0, b1 = balls
+        self.pos = arrays["pos"][b0:b1]
+        self.vel = arrays["vel"][b0:b1]
+        self.hits = arrays["hits"][b0:b1]
+        self.angle = arrays["angle"][a0:a1]
+        self.local = arrays["arena"][b0:b1] - a0
+        for name in ARENA_PARAMS:
+            setattr(self, name, arrays[name][a0:a1][self.local])
+        self.arena_spin = arrays["angular_velocity"][a0:a1]
+        self.center = np.array(geometry["center"])
+        self.ball_radius = geometry["ball_radius"]
+        self.vertices = polygon_vertices(0.0, 0.0, geometry["hex_radius"], 0.0, geometry["sides"])
+
+    def step(self, dt):
+        pos, vel = self.pos, self.vel
+        vel[:, 1] += self.gravity * dt
+        pos += vel * dt
+        self.angle += self.arena_spin * dt
+
+        theta = self.angle[self.local]
+        c, s = np.cos(theta), np.sin(theta)
+        rx, ry = pos[:, 0] - self.center[0], pos[:, 1] - self.center[1]
+        local_pos = np.stack([c * rx + s * ry, c * ry - s * rx], axis=1)
+        local_vel = np.stack([c * vel[:, 0] + s * vel[:, 1], c * vel[:, 1] - s * vel[:, 0]], axis=1)
+
+        touched, _ = collide_with_edges(local_pos, local_vel, self.vertices, (0.0, 0.0), self.angular_velocity,
+                                        self.ball_radius, self.restitution, self.friction_coeff, self.hits)
+        idx = np.nonzero(touched)[0]
+        if len(idx):
+            c, s = c[idx], s[idx]
+            lx, ly = local_pos[idx, 0], local_pos[idx, 1]
+            pos[idx, 0] = self.center[0] + c * lx - s * ly
+            pos[idx, 1] = self.center[1] + s * lx + c * ly
+            lvx, lvy = local_vel[idx, 0], local_vel[idx, 1]
+            vel[idx, 0] = c * lvx - s * lvy
+            vel[idx, 1] = s * lvx + c * lvy
+
+
+def _worker(name, fields, arenas, balls, geometry, conn):
+    block = shared_memory.SharedMemory(name=name)
+    shard = Shard(views(block.buf, fields), arenas, balls, geometry)
+    try:
+        while True:
+            command = conn.recv()
+            if command is None:
+                break
+            steps, dt = command
+            start = time.perf_counter()
+            for _ in range(steps):
+                shard.step(dt)
+            conn.send(time.perf_counter() - start)
+    finally:
+        del shard
+        block.close()
+
+
+class ArenaFarm:
+    """
+    'arenas' arenas of 'balls' balls each, split over 'workers' processes.
+
+    'params' maps a name in ``O3MiniHigh.PARAMS`` to a scalar or an array of
+    one value per arena.  Use as a context manager, or call :meth:`close`.
+    """
+
+    def __init__(self, arenas, balls, workers=None, seed=None, speed=200.0,
+                 center=O3MiniHigh.CENTER, hex_radius=O3MiniHigh.HEX_RADIUS, ball_radius=O3MiniHigh.BALL_RADIUS,
+                 sides=6, **params):
+        unknown = sorted(set(params) - set(ARENA_PARAMS))
+        if unknown:
+            raise TypeError(f"ArenaFarm got unexpected parameters: {', '.join(unknown)}")
+        self.arenas, self.balls = arenas, balls
+        self.workers = max(1, min(workers or os.cpu_count() or 1, arenas))
+        self.geometry = {"center": tuple(map(float, center)), "hex_radius": float(hex_radius),
+                         "ball_radius": float(ball_radius), "sides": int(sides)}
+        self.time = 0.0
+        self.steps = 0
+
+        self.fields, size = layout(arenas, arenas * balls)
+        self._block = shared_memory.SharedMemory(create=True, size=size)
+        self.arrays = views(self._block.buf, self.fields)
+        self._populate(seed, speed, params)
+        self._processes, self._conns = [], []
+        self._start()
+
+    def _populate(self, seed, speed, params):
+        a = self.arrays
+        a["hits"][:] = 0
+        a["angle"][:] = 0.0
+        for name in ARENA_PARAMS:
+            a[name][:] = params.get(name, O3MiniHigh.PARAMS[name])
+        a["arena"][:] = np.repeat(np.arange(self.arenas, dtype=np.int32), self.balls)
+
+        rng = np.random.default_rng(seed)
+        n = len(a["arena"])
+        inner = self.geometry["hex_radius"] * math.cos(math.pi / self.geometry["sides"]) - self.geometry["ball_radius"]
+        radius = inner * np.sqrt(rng.random(n))
+        theta = rng.uniform(0, 2 * math.pi, n)
+        a["pos"][:] = np.array(self.geometry["center"]) + np.stack([radius * np.cos(theta),
+                                                                     radius * np.sin(theta)], axis=1)
+        heading = rng.uniform(0, 2 * math.pi, n)
+        a["vel"][:] = speed * np.stack([np.cos(heading), np.sin(heading)], axis=1)
+
+    def _start(self):
+        bounds = np.linspace(0, self.arenas, self.workers + 1).astype(int)
+        for a0, a1 in zip(bounds[:-1], bounds[1:]):
+            parent, child = mp.Pipe()
+            process = mp.Process(target=_worker, daemon=True,
+                                 args=(self._block.name, self.fields, (int(a0), int(a1)),
+                                       (int(a0) * self.balls, int(a1) * self.balls), self.geometry, child))
+            process.start()
+            self._processes.append(process)
+            self._conns.append(parent)
+
+    def run(self, steps, dt):
+        """Advance every arena 'steps' steps of 'dt'; returns each worker's busy time."""
+        for conn in self._conns:
+            conn.send((steps, dt))
+        busy = [conn.recv() for conn in self._conns]
+        self.time += steps * dt
+        self.steps += steps
+        return busy
+
+    def bounces(self):
+        """Bounces so far per arena."""
+        return np.bincount(self.arrays["arena"], weights=self.arrays["hits"], minlength=self.arenas).astype(np.int64)
+
+    def energy(self):
+        """Mean mechanical energy per unit mass of each arena's balls."""
+        a = self.arrays
+        per_ball = (0.5 * np.einsum("ij,ij->i", a["vel"], a["vel"])
+                    + a["gravity"][a["arena"]] * (self.geometry["center"][1] - a["pos"][:, 1]))
+        return np.bincount(a["arena"], weights=per_ball, minlength=self.arenas) / self.balls
+
+    def outside(self):
+        """Per arena, how many balls have left the polygon."""
+        a = self.arrays
+        rel = a["pos"] - np.array(self.geometry["center"])
+        angle = a["angle"][a["arena"]]
+        sector = 2 * math.pi / self.geometry["sides"]
+        k = np.floor((np.arctan2(rel[:, 1], rel[:, 0]) - angle) / sector)
+        normal_angle = angle + (k + 0.5) * sector
+        apothem = self.geometry["hex_radius"] * math.cos(math.pi / self.geometry["sides"])
+        out = rel[:, 0] * np.cos(normal_angle) + rel[:, 1] * np.sin(normal_angle) > apothem
+        return np.bincount(a["arena"], weights=out, minlength=self.arenas).astype(np.int64)
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+        self._conns, self._processes = [], []
+        if self._block is not None:
+            self.arrays = None
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.arenas",
+                                     description="Step many independent arenas on shared-memory workers.")
+    parser.add_argument("--arenas", type=int, default=4000)
+    parser.add_argument("--balls", type=int, default=8, help="balls per arena")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--steps", type=int, default=600)
+    parser.add_argument("--batch", type=int, default=60, help="steps per command sent to the workers")
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--range", action="append", default=[], metavar="NAME=LOW:HIGH",
+                        help="draw a constant uniformly per arena (repeatable)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    params = {}
+    for spec in args.range:
+        name, low, high = parse_range(spec)
+        params[name] = rng.uniform(low, high, args.arenas)
+
+    with ArenaFarm(args.arenas, args.balls, workers=args.workers, seed=args.seed, **params) as farm:
+        start = time.perf_counter()
+        busy = [0.0] * farm.workers
+        done = 0
+        while done < args.steps:
+            batch = min(args.batch, args.steps - done)
+            busy = [b + t for b, t in zip(busy, farm.run(batch, args.dt))]
+            done += batch
+        elapsed = time.perf_counter() - start
+
+        ball_steps = args.arenas * args.balls * args.steps
+        bounces, energy, outside = farm.bounces(), farm.energy(), farm.outside()
+        print(f"{args.arenas} arenas x {args.balls} balls x {args.steps} steps on {farm.workers} workers "
+              f"in {elapsed:.2f} s: {ball_steps / elapsed:,.0f} ball-steps/s, "
+              f"IPC/idle overhead {1 - sum(busy) / (farm.workers * elapsed):.1%}")
+        print(f"  bounces per arena: mean {bounces.mean():.1f}, max {bounces.max()}")
+        print(f"  energy per arena: mean {energy.mean():.1f}, std {energy.std():.1f}")
+        print(f"  balls outside: {int(outside.sum())}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,3 @@
+"""
+Benchmarks for the hexsim engines.  Each module runs with ``python -m``.
+"""
@@ -0,0 +1,77 @@
+"""
+Scaling of ball-ball collision handling with the number of balls.
+
+    python -m hexsim.benchmarks.ball_collisions --balls 1000 2000 4000 8000 16000
+
+For each N, times a full batched step with ball-ball contacts (spatial hash)
+and, up to --naive-limit balls, the O(N^2) all-pairs test for comparison.
+The fitted exponent of time against N should stay close to 1.
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from ..batched import BatchedSimulation
+from ..spatial_hash import find_pairs
+
+
+def find_pairs_naive(pos, ball_radius):
+    """All-pairs reference: every pair closer than two radii."""
+    i, j = np.triu_indices(len(pos), k=1)
+    d = pos[i] - pos[j]
+    close = np.einsum("ij,ij->i", d, d) < (2 * ball_radius) ** 2
+    return i[close], j[close]
+
+
+def _per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def make_scene(n, seed=0):
+    """'n' balls in a hexagon scaled so the packing fraction stays constant."""
+    ball_radius = 4.0
+    # About 30% of the hexagon's area covered by balls.
+    area = n * math.pi * ball_radius ** 2 / 0.3
+    hex_radius = math.sqrt(2 * area / (3 * math.sqrt(3)))
+    sim = BatchedSimulation.random(n, seed=seed, hex_radius=hex_radius, ball_radius=ball_radius,
+                                   ball_collisions=True)
+    sim.run(20, 1 / 120)  # let the initial overlaps settle
+    return sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.benchmarks.ball_collisions",
+                                     description="Time ball-ball collisions against the ball count.")
+    parser.add_argument("--balls", type=int, nargs="+", default=[1000, 2000, 4000, 8000, 16000, 32000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--naive-limit", type=int, default=4000,
+                        help="largest N for the O(N^2) comparison")
+    args = parser.parse_args(argv)
+
+    print(f"{'balls':>8} {'step ms':>10} {'us/ball':>9} {'pairs':>8} {'hash ms':>9} {'naive ms':>9}")
+    sizes, step_times = [], []
+    for n in args.balls:
+        sim = make_scene(n)
+        step = _per_call(lambda: sim.step(1 / 120), args.repeat)
+        pairs = len(find_pairs(sim.pos, sim.ball_radius)[0])
+        hashed = _per_call(lambda: find_pairs(sim.pos, sim.ball_radius), args.repeat)
+        naive = "-"
+        if n <= args.naive_limit:
+            naive = f"{_per_call(lambda: find_pairs_naive(sim.pos, sim.ball_radius), max(1, args.repeat // 4)) * 1e3:9.2f}"
+        print(f"{n:>8} {step * 1e3:>10.2f} {step / n * 1e6:>9.2f} {pairs:>8} {hashed * 1e3:>9.2f} {naive:>9}")
+        sizes.append(n)
+        step_times.append(step)
+
+    if len(sizes) > 1:
+        exponent = np.polyfit(np.log(sizes), np.log(step_times), 1)[0]
+        print(f"step time ~ N^{exponent:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
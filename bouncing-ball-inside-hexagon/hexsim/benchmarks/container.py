@@ -0,0 +1,62 @@
+"""
+Micro-benchmark: per-step cost of mesh containers by edge count, scanning
+every edge (``collision="local"``) against the grid lookup (``"sector"``).
+
+    python -m hexsim.benchmarks.container --teeth 15 --teeth 60 --teeth 250 --teeth 1000
+    python -m hexsim.benchmarks.container --file part.txt --cell 8
+
+The containers are :func:`~hexsim.container.gear` rings unless ``--file``
+names a vertex file.  For each one the table gives the edge count, the grid
+build time, the mean and largest number of edges per occupied cell, and
+steps per second in both modes (which produce the same trajectory).
+"""
+import argparse
+import time
+
+from ..container import MeshContainer, gear, read_outline
+from ..engine import IMPLEMENTATIONS, create
+
+
+def steps_per_second(sim, seconds, dt=1 / 60):
+    """Steps per second of 'sim' over about 'seconds' of wall time."""
+    done, chunk = 0, 100
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        sim.run(chunk, dt)
+        done += chunk
+        chunk *= 2
+    return done / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.benchmarks.container",
+                                     description="Time mesh containers with and without the edge grid.")
+    parser.add_argument("--impl", choices=sorted(IMPLEMENTATIONS), default="o3-mini-high")
+    parser.add_argument("--teeth", type=int, action="append",
+                        help="gear ring tooth counts to try (repeatable; default: 15, 60, 250, 1000)")
+    parser.add_argument("--file", action="append", help="vertex files to try instead (repeatable)")
+    parser.add_argument("--cell", type=float, help="grid spacing (default: the ball radius margin)")
+    parser.add_argument("--seconds", type=float, default=1.0, help="wall time per measurement")
+    args = parser.parse_args(argv)
+
+    if args.file:
+        shapes = [(path, read_outline(path)) for path in args.file]
+    else:
+        shapes = [(f"gear {teeth}", gear(teeth)) for teeth in args.teeth or (15, 60, 250, 1000)]
+
+    print(f"{'container':<16}{'edges':>7}{'build ms':>10}{'mean/cell':>11}{'max/cell':>10}"
+          f"{'local steps/s':>15}{'sector steps/s':>16}{'speed-up':>10}")
+    for label, loops in shapes:
+        start = time.perf_counter()
+        container = MeshContainer(loops, cell=args.cell)
+        build = time.perf_counter() - start
+        occupied = [len(cell) for cell in container.cells if cell]
+        rates = [steps_per_second(create(args.impl, collision=mode, container=container), args.seconds)
+                 for mode in ("local", "sector")]
+        print(f"{label:<16}{container.sides:>7}{build * 1e3:>10.1f}{sum(occupied) / len(occupied):>11.1f}"
+              f"{max(occupied):>10}{rates[0]:>15,.0f}{rates[1]:>16,.0f}{rates[1] / rates[0]:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
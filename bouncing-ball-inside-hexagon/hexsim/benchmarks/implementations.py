@@ -0,0 +1,232 @@
+"""
+Cross-implementation benchmark: cost and correctness of the four scripts' physics.
+
+    python -m hexsim.benchmarks.implementations --out results.json
+
+Every implementation starts from the same geometry and ball state
+(``INITIAL``); only its own physics constants differ.  For each one we report:
+
+- ``steps_per_sec``: a plain ``run()`` loop, nothing else measured;
+- ``latency_ns``: percentiles of individually timed steps (``timer_ns`` is
+  the cost of the timer itself, included in every sample);
+- ``peak_bytes_per_step``: mean high-water mark, in bytes, of the heap a
+  step allocates above what it started with (its temporaries), and
+  ``retained_blocks_per_step``: heap blocks still allocated afterwards, per
+  step (non-zero means the step leaks); both from tracemalloc with the
+  cyclic GC paused.  Allocations per step are not reported: CPython only
+  exposes live totals (tracemalloc, ``sys.getallocatedblocks()``,
+  ``gc.get_count()`` all go back down when a temporary is freed), so a
+  step's short-lived floats and tuples cannot be counted from Python.  The
+  JSON says so under ``meta.not_measured``;
+- ``energy``: initial, final and maximum energy over the long run, and the
+  final drift relative to the initial energy;
+- ``steps_outside``: steps of the long run that ended with the ball's center
+  outside the hexagon, and ``escapes``: how often it went out.
+
+Results go to a JSON file together with rankings by speed and by escapes.
+"""
+import argparse
+import gc
+import json
+import math
+import platform
+import time
+import tracemalloc
+
+from ..engine import IMPLEMENTATIONS, Simulation, create
+
+# Identical starting conditions for every implementation.
+INITIAL = {
+    "center": (400.0, 300.0),
+    "hex_radius": 250.0,
+    "ball_radius": 15.0,
+    "pos": (400.0, 200.0),
+    "vel": (200.0, 0.0),
+    "angle": 0.0,
+}
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    k = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def measure_rate(impl, steps, dt, collision="discrete"):
+    sim = create(impl, collision=collision, **INITIAL)
+    start = time.perf_counter()
+    sim.run(steps, dt)
+    return steps / (time.perf_counter() - start)
+
+
+def measure_latency(impl, steps, dt, collision="discrete"):
+    sim = create(impl, collision=collision, **INITIAL)
+    step = sim.step
+    clock = time.perf_counter_ns
+    samples = [0] * steps
+    for k in range(steps):
+        t0 = clock()
+        step(dt)
+        samples[k] = clock() - t0
+
+    overhead = [0] * 1000
+    for k in range(len(overhead)):
+        t0 = clock()
+        overhead[k] = clock() - t0
+
+    samples.sort()
+    overhead.sort()
+    return {
+        "p50": percentile(samples, 50),
+        "p90": percentile(samples, 90),
+        "p99": percentile(samples, 99),
+        "p999": percentile(samples, 99.9),
+        "max": samples[-1],
+        "timer_ns": percentile(overhead, 50),
+    }
+
+
+def measure_allocations(impl, steps, dt, collision="discrete"):
+    sim = create(impl, collision=collision, **INITIAL)
+    sim.run(100, dt)  # warm up caches and free lists first
+    step = sim.step
+    enabled = gc.isenabled()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        peak_total = 0
+        for _ in range(steps):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            step(dt)
+            peak_total += tracemalloc.get_traced_memory()[1] - current
+        # The blocks left behind come from a separate run, so the sampling
+        # above cannot be counted among them.
+        before = tracemalloc.take_snapshot()
+        for _ in range(steps):
+            step(dt)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        if enabled:
+            gc.enable()
+    own = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    retained = sum(stat.count_diff for stat in
+                   after.filter_traces(own).compare_to(before.filter_traces(own), "filename"))
+    return {
+        "peak_bytes_per_step": peak_total / steps,
+        "retained_blocks_per_step": retained / steps,
+    }
+
+
+def measure_long_run(impl, steps, dt, collision="discrete"):
+    sim = create(impl, collision=collision, **INITIAL)
+    step = sim.step
+    energy = sim.energy
+    is_outside = sim.is_outside
+
+    initial = max_energy = energy()
+    steps_outside = escapes = 0
+    was_outside = False
+    for _ in range(steps):
+        step(dt)
+        e = energy()
+        if e > max_energy:
+            max_energy = e
+        outside = is_outside()
+        if outside:
+            steps_outside += 1
+            if not was_outside:
+                escapes += 1
+        was_outside = outside
+
+    final = energy()
+    finite = all(math.isfinite(v) for v in (sim.x, sim.y, sim.vx, sim.vy))
+    return {
+        "energy": {
+            "initial": initial,
+            "final": final,
+            "max": max_energy,
+            "drift": final - initial,
+            "relative_drift": (final - initial) / abs(initial) if initial else float("nan"),
+        },
+        "steps_outside": steps_outside,
+        "escapes": escapes,
+        "bounces": sim.bounces,
+        "finite": finite,
+    }
+
+
+def benchmark(impl, steps, rate_steps, latency_steps, alloc_steps, dt, collision="discrete"):
+    result = {"steps_per_sec": measure_rate(impl, rate_steps, dt, collision)}
+    result["latency_ns"] = measure_latency(impl, latency_steps, dt, collision)
+    result.update(measure_allocations(impl, alloc_steps, dt, collision))
+    result.update(measure_long_run(impl, steps, dt, collision))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.benchmarks.implementations",
+                                     description="Benchmark the four implementations headlessly.")
+    parser.add_argument("--impl", action="append", choices=sorted(IMPLEMENTATIONS),
+                        help="implementation to benchmark (repeatable; default: all)")
+    parser.add_argument("--steps", type=int, default=1_000_000, help="long-run steps for energy and escapes")
+    parser.add_argument("--rate-steps", type=int, default=200_000)
+    parser.add_argument("--latency-steps", type=int, default=100_000)
+    parser.add_argument("--alloc-steps", type=int, default=10_000)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--collision", choices=list(Simulation.COLLISION_MODES), default="discrete")
+    parser.add_argument("--out", default="benchmark-results.json", help="JSON file to write")
+    args = parser.parse_args(argv)
+    for option in ("steps", "rate_steps", "latency_steps", "alloc_steps"):
+        if getattr(args, option) < 1:
+            parser.error(f"--{option.replace('_', '-')} must be at least 1")
+
+    impls = args.impl or list(IMPLEMENTATIONS)
+    results = {}
+    for impl in impls:
+        start = time.perf_counter()
+        results[impl] = benchmark(impl, args.steps, args.rate_steps, args.latency_steps,
+                                  args.alloc_steps, args.dt, args.collision)
+        r = results[impl]
+        print(f"{impl:>14}: {r['steps_per_sec']:>10,.0f} steps/s  p50 {r['latency_ns']['p50']:>6} ns  "
+              f"p99 {r['latency_ns']['p99']:>6} ns  peak {r['peak_bytes_per_step']:>5.0f} B/step  "
+              f"drift {r['energy']['relative_drift']:+.3f}  outside {r['steps_outside']}  "
+              f"({time.perf_counter() - start:.1f} s)")
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "dt": args.dt,
+            "collision": args.collision,
+            "steps": args.steps,
+            "rate_steps": args.rate_steps,
+            "latency_steps": args.latency_steps,
+            "alloc_steps": args.alloc_steps,
+            "initial": INITIAL,
+            "not_measured": {
+                "allocations_per_step": "CPython exposes only live heap totals, which a step's freed "
+                                        "temporaries leave unchanged; see peak_bytes_per_step",
+            },
+        },
+        "results": results,
+        "ranking": {
+            "by_speed": sorted(results, key=lambda k: -results[k]["steps_per_sec"]),
+            "by_steps_outside": sorted(results, key=lambda k: (results[k]["steps_outside"],
+                                                              -results[k]["steps_per_sec"])),
+        },
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
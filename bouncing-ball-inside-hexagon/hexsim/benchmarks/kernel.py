@@ -0,0 +1,109 @@
+"""
+Micro-benchmark: per-step cost of the script's collision pass against the
+cached rotating-frame kernel (``collision="discrete"`` vs ``"local"`` vs
+``"sector"``).
+
+    python -m hexsim.benchmarks.kernel --impl o3-mini-high --impl o3-mini
+    python -m hexsim.benchmarks.kernel --sides 1000 --steps 20000
+
+For each mode it reports time per step, trig calls per step (cos, sin,
+radians and atan2, counted by swapping a counting proxy in for ``math``)
+and the mean transient heap bytes per step under tracemalloc.
+"""
+import argparse
+import math
+import time
+import tracemalloc
+from collections import Counter
+
+from .. import engine, kernel
+from ..engine import IMPLEMENTATIONS, create
+
+TRIG = ("cos", "sin", "radians", "atan2")
+
+
+class _CountingMath:
+    """Stands in for the math module and counts calls to the trig functions."""
+
+    def __init__(self, counts):
+        self._counts = counts
+
+    def __getattr__(self, name):
+        value = getattr(math, name)
+        if name not in TRIG:
+            return value
+        counts = self._counts
+
+        def counted(*args):
+            counts[name] += 1
+            return value(*args)
+        return counted
+
+
+MODES = ("discrete", "local", "sector")
+
+
+def time_per_step(impl, collision, steps, dt, sides=None):
+    sim = create(impl, collision=collision, sides=sides)
+    sim.run(100, dt)
+    start = time.perf_counter()
+    sim.run(steps, dt)
+    return (time.perf_counter() - start) / steps
+
+
+def trig_per_step(impl, collision, steps, dt, sides=None):
+    sim = create(impl, collision=collision, sides=sides)
+    counts = Counter()
+    saved = engine.math, kernel.math
+    engine.math = kernel.math = _CountingMath(counts)
+    try:
+        sim.run(steps, dt)
+    finally:
+        engine.math, kernel.math = saved
+    return {name: counts[name] / steps for name in TRIG}
+
+
+def bytes_per_step(impl, collision, steps, dt, sides=None):
+    sim = create(impl, collision=collision, sides=sides)
+    sim.run(100, dt)
+    step = sim.step
+    total = 0
+    tracemalloc.start()
+    try:
+        for _ in range(steps):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            step(dt)
+            total += tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    return total / steps
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.benchmarks.kernel",
+                                     description="Compare the script collision pass with the cached kernel.")
+    parser.add_argument("--impl", action="append", choices=sorted(IMPLEMENTATIONS),
+                        help="implementation (repeatable; default: o3-mini-high)")
+    parser.add_argument("--steps", type=int, default=200_000)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--sides", type=int, help="polygon side count (default: the script's own)")
+    parser.add_argument("--mode", action="append", choices=MODES, help="collision mode (repeatable; default: all)")
+    args = parser.parse_args(argv)
+    modes = args.mode or list(MODES)
+
+    print(f"{'impl':>14} {'mode':>9} {'ns/step':>9} {'trig/step':>10} {'bytes/step':>11} {'speedup':>8}")
+    for impl in args.impl or ["o3-mini-high"]:
+        baseline = None
+        for collision in modes:
+            per_step = time_per_step(impl, collision, args.steps, args.dt, args.sides)
+            trig = sum(trig_per_step(impl, collision, args.steps // 10, args.dt, args.sides).values())
+            alloc = bytes_per_step(impl, collision, args.steps // 20, args.dt, args.sides)
+            baseline = baseline or per_step
+            print(f"{impl:>14} {collision:>9} {per_step * 1e9:>9.0f} {trig:>10.2f} {alloc:>11.1f} "
+                  f"{baseline / per_step:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+"""
+Frame cost of the renderers as the number of balls grows.
+
+    python -m hexsim.benchmarks.render --balls 100 1000 10000 50000
+
+Balls come from a settled :class:`~hexsim.batched.BatchedSimulation`, so they
+pile up on the lower walls as they would in a real run.  For each N, times
+:meth:`paint` (everything except presenting the frame) of the per-ball
+``draw.circle`` renderer and of the ``surfarray`` bulk renderer, and how many
+frames per second that leaves.  Runs without a display (SDL's dummy video
+driver) unless SDL_VIDEODRIVER is set.
+"""
+import argparse
+import os
+import time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.benchmarks.render",
+                                     description="Time the full and bulk renderers against ball count.")
+    parser.add_argument("--balls", type=int, nargs="+", default=[100, 1000, 10_000, 50_000])
+    parser.add_argument("--ball-radius", type=float, default=3.0)
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--settle", type=int, default=120, help="physics steps before drawing")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+
+    from ..batched import BatchedSimulation
+    from ..render import BulkRenderer, FullRenderer
+    from ..scene import HEIGHT, WIDTH
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    print(f"{'balls':>8}{'full ms':>10}{'bulk ms':>10}{'full fps':>10}{'bulk fps':>10}")
+    for n in args.balls:
+        sim = BatchedSimulation.random(n, seed=0, ball_radius=args.ball_radius).run(args.settle, 1 / 60)
+        row = []
+        for renderer, balls in ((FullRenderer, sim.pos.tolist()), (BulkRenderer, sim.pos)):
+            view = renderer(screen, sim.center, sim.hex_radius, sim.ball_radius, sim.sides)
+            view.paint(sim.angle, balls)
+            start = time.perf_counter()
+            for _ in range(args.frames):
+                view.paint(sim.angle, balls)
+            row.append((time.perf_counter() - start) / args.frames)
+        full, bulk = row
+        print(f"{n:>8}{full * 1e3:>10.2f}{bulk * 1e3:>10.2f}{1 / full:>10.0f}{1 / bulk:>10.0f}")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+"""
+Process startup benchmark: how long a fresh interpreter takes to get going.
+
+    python -m hexsim.benchmarks.startup --repeat 20
+
+Batch jobs start many short-lived processes, so the fixed cost of each one
+(interpreter, imports, subsystem initialization) can outweigh the work it
+does.  Every case runs in a new ``python`` process 'repeat' times, and the
+table shows the median and minimum wall time and the median cost above a
+bare interpreter.  The cases show what headless runs pay (:mod:`hexsim` never
+imports pygame) next to what importing and initializing pygame costs,
+including the difference between ``pygame.init()``, which also brings up
+audio and joysticks, and the ``pygame.display.init()`` the front ends call.
+
+Set ``SDL_VIDEODRIVER=dummy`` to measure without a display; audio is left
+alone so ``pygame.init()`` pays what it would on the machine.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CASES = {
+    "python": ["-c", "pass"],
+    "import hexsim": ["-c", "import hexsim"],
+    "hexsim 60 steps": ["-c", "import hexsim; hexsim.create('o3-mini-high').run(60, 1 / 60)"],
+    "script --headless": ["o3-mini-high-bouncing-ball-inside-hexagon.py", "--headless", "--steps", "60"],
+    "import hexsim.batched": ["-c", "import hexsim.batched"],
+    "import pygame": ["-c", "import pygame"],
+    "pygame.display.init()": ["-c", "import pygame; pygame.display.init()"],
+    "pygame.init()": ["-c", "import pygame; pygame.init()"],
+}
+
+
+def time_case(args, repeat):
+    """Wall times in seconds of 'repeat' fresh interpreters running 'args'."""
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    command = [sys.executable, *args]
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.benchmarks.startup",
+                                     description="Time fresh interpreter startup for hexsim and pygame.")
+    parser.add_argument("--repeat", type=int, default=20, help="processes started per case (default: 20)")
+    parser.add_argument("--case", action="append", choices=list(CASES),
+                        help="only run these cases (repeatable; default: all)")
+    parser.add_argument("--out", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    names = args.case or list(CASES)
+    if "python" not in names:
+        names.insert(0, "python")
+    results = {}
+    for name in names:
+        times = time_case(CASES[name], args.repeat)
+        results[name] = {"median_ms": statistics.median(times) * 1e3, "min_ms": min(times) * 1e3}
+
+    baseline = results["python"]["median_ms"]
+    print(f"{'case':<24}{'median ms':>11}{'min ms':>9}{'+ python':>10}")
+    for name, row in results.items():
+        row["over_python_ms"] = row["median_ms"] - baseline
+        print(f"{name:<24}{row['median_ms']:>11.1f}{row['min_ms']:>9.1f}{row['over_python_ms']:>+10.1f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"python": sys.version, "repeat": args.repeat, "results": results}, f, indent=2)
+        print(f"wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""
+Command-line entry point for headless runs and the interactive viewer.
+
+    python -m hexsim --impl o3-mini-high --headless --steps 1000000
+    python -m hexsim --impl o3-mini-high --renderer dirty
+
+Each script in this directory forwards ``--headless`` here with its own
+``--impl``, so ``python o1-bouncing-ball-inside-hexagon.py --headless --steps N``
+runs the same physics with no window and no frame limiter.  Without
+``--headless`` the engine is shown in a window (see :mod:`hexsim.viewer`).
+Either way ``--record PATH`` writes every step to a trajectory file that
+``python -m hexsim.recording replay PATH`` plays back.
+"""
+import argparse
+import time
+
+from .engine import IMPLEMENTATIONS, Simulation, create
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="hexsim",
+                                     description="Run the hexagon simulations headlessly or in a window.")
+    parser.add_argument("--impl", choices=sorted(IMPLEMENTATIONS), default="o3-mini-high",
+                        help="which script's physics to run")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a display or frame limiter")
+    parser.add_argument("--steps", type=int, default=60 * 60,
+                        help="number of fixed steps to simulate (default: one minute at 60 Hz)")
+    parser.add_argument("--dt", type=float, default=1 / 60,
+                        help="fixed timestep in seconds (default: 1/60)")
+    parser.add_argument("--collision", choices=list(Simulation.COLLISION_MODES), default="discrete",
+                        help="collision detection mode (default: the script's own discrete test)")
+    parser.add_argument("--integrator", choices=list(Simulation.INTEGRATORS), default="script",
+                        help="free-flight integrator; anything but the script's own needs --collision local or "
+                             "sector (default: script)")
+    parser.add_argument("--sides", type=int, help="polygon side count (default: 6); pair large counts "
+                                                  "with --collision sector")
+    parser.add_argument("--container", metavar="PATH",
+                        help="spin the outline in this vertex file instead of a regular polygon (see "
+                             "hexsim.container); needs --collision local or sector")
+    parser.add_argument("--renderer", choices=["full", "dirty", "bulk"], default="full",
+                        help="window mode: repaint everything, only dirty rectangles, or splat balls through a "
+                             "pixel array (default: full)")
+    parser.add_argument("--fps", type=int, default=60, help="window mode frame rate (default: 60)")
+    parser.add_argument("--physics-hz", type=float, default=240,
+                        help="window mode fixed physics rate, independent of --fps; 0 steps by frame time "
+                             "like the scripts (default: 240)")
+    parser.add_argument("--max-catch-up", type=int, default=8,
+                        help="window mode cap on physics steps per frame (default: 8)")
+    parser.add_argument("--split", action="store_true",
+                        help="window mode: step the physics in a separate process, handing frames to the window "
+                             "through shared memory (see hexsim.split)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record every step to a trajectory file (see hexsim.recording)")
+    parser.add_argument("--profile-trace", metavar="PATH",
+                        help="window mode: write per-phase frame timings as a Chrome trace on exit")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.integrator != "script" and args.collision not in ("local", "sector"):
+        parser.error(f"--integrator {args.integrator} needs --collision local or sector")
+    container = None
+    if args.container:
+        if args.collision not in ("local", "sector"):
+            parser.error("--container needs --collision local or sector")
+        if args.record:
+            parser.error("trajectory files only describe regular polygons; drop --record with --container")
+        from .container import MeshContainer
+
+        container = MeshContainer.from_file(args.container)
+    if not args.headless:
+        from .viewer import run
+
+        sim = create(args.impl, collision=args.collision, integrator=args.integrator, sides=args.sides,
+                     container=container)
+        if args.split:
+            if args.record or args.profile_trace or not args.physics_hz:
+                parser.error("--split takes neither --record nor --profile-trace, and needs --physics-hz > 0")
+            from .split import window
+
+            window(("engine", sim.name, sim.settings()), renderer=args.renderer, fps=args.fps,
+                   physics_hz=args.physics_hz, max_steps=args.max_catch_up)
+            return 0
+        run(sim, renderer=args.renderer, fps=args.fps, record=args.record, profile_trace=args.profile_trace,
+            physics_hz=args.physics_hz, max_steps=args.max_catch_up)
+        return 0
+    if args.steps < 0 or args.dt <= 0:
+        parser.error("--steps must be >= 0 and --dt must be > 0")
+
+    sim = create(args.impl, collision=args.collision, integrator=args.integrator, sides=args.sides,
+                 container=container)
+    start = time.perf_counter()
+    if args.record:
+        from .recording import record_run
+
+        record_run(sim, args.record, args.steps, args.dt)
+    else:
+        sim.run(args.steps, args.dt)
+    elapsed = time.perf_counter() - start
+
+    rate = args.steps / elapsed if elapsed > 0 else float("inf")
+    print(f"{sim.name}: {sim.steps} steps of {args.dt:g} s ({sim.time:.1f} s simulated) "
+          f"in {elapsed:.3f} s wall, {rate:,.0f} steps/s")
+    print(f"  ball pos=({sim.x:.3f}, {sim.y:.3f}) vel=({sim.vx:.3f}, {sim.vy:.3f}) "
+          f"bounces={sim.bounces} outside={sim.is_outside()}")
+    return 0
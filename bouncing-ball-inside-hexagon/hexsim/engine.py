@@ -0,0 +1,886 @@
+"""
+Headless, fixed-timestep ports of the four hexagon simulations.
+
+The scripts in this directory tie their physics to ``clock.tick(60)`` and a
+pygame window, so a run can never go faster than real time.  Each class below
+carries the physics of one script over to plain floats -- same integration
+order, same collision test, same response -- with ``dt`` supplied by the caller
+instead of the frame limiter.  Nothing here imports pygame.
+
+    sim = create("o3-mini-high")
+    for _ in range(1_000_000):
+        sim.step(1 / 60)
+
+Collision modes (the ``collision`` argument):
+
+``"discrete"``
+    The script's own overlap test after the position update.  The default.
+``"swept"``
+    Continuous detection: the ball's straight path over the step is swept
+    against the polygon as it rotates, and the script's response is applied
+    at the time of impact if the ball is moving into the wall as the script
+    sees it (:meth:`Simulation.approaching`).  The ball cannot tunnel, so ``dt`` can be much
+    larger for the same number of escapes (none).
+``"local"``
+    The script's own contact test and response evaluated in the polygon's
+    own frame against geometry cached by :mod:`hexsim.kernel`: one cos/sin
+    pair per step and no vertex lists.  Same results as ``"discrete"``, up
+    to rounding.
+``"sector"``
+    Like ``"local"``, but only the edge facing the ball and its nearer
+    neighbour are tested, looked up from the ball's polar angle, so the cost
+    per step doesn't grow with ``sides``.  Identical to ``"local"`` on the
+    hexagon.
+
+Integrators (the ``integrator`` argument) choose how ``"local"`` and
+``"sector"`` move the ball between contacts:
+
+``"script"``
+    The script's own update: semi-implicit Euler with its per-step damping,
+    in its order.  The default, and the only choice for the other modes.
+``"euler"``, ``"verlet"``, ``"rk4"``
+    Semi-implicit Euler, velocity Verlet and classic Runge-Kutta for
+    gravity plus the script's damping as a continuous drag (see
+    :attr:`Simulation.drag`).  First, second and fourth order in ``dt``;
+    see :mod:`hexsim.benchmarks.integrators` for accuracy against cost.
+
+With ``"local"`` and ``"sector"`` the regular polygon can also be replaced by
+any outline: pass ``container=`` a :class:`~hexsim.container.MeshContainer`
+(``"sector"`` then tests only the edges in the ball's grid cell).
+"""
+import math
+
+from .kernel import rotating_polygon
+
+
+class WorldState:
+    """
+    Everything that changes while a :class:`Simulation` runs: the ball's
+    position and velocity, the polygon's rotation, and the clock and
+    counters.  Taken with :meth:`Simulation.snapshot` and put back with
+    :meth:`Simulation.restore`; restoring is exact, so a run continued from a
+    snapshot is identical to one that never stopped.
+
+    'angle' is the rotation as the implementation stores it: radians, except
+    for o1, which keeps degrees.
+    """
+
+    __slots__ = ("x", "y", "vx", "vy", "angle", "time", "steps", "bounces")
+
+    def __init__(self, x, y, vx, vy, angle, time=0.0, steps=0, bounces=0):
+        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+        self.angle = angle
+        self.time, self.steps, self.bounces = time, steps, bounces
+
+    def astuple(self):
+        return self.x, self.y, self.vx, self.vy, self.angle, self.time, self.steps, self.bounces
+
+    def replace(self, **changes):
+        """A copy with some fields changed."""
+        state = WorldState(*self.astuple())
+        for key, value in changes.items():
+            setattr(state, key, value)
+        return state
+
+    def __eq__(self, other):
+        return isinstance(other, WorldState) and self.astuple() == other.astuple()
+
+    def __repr__(self):
+        return "WorldState(" + ", ".join(f"{key}={getattr(self, key)!r}" for key in self.__slots__) + ")"
+
+    def __getstate__(self):
+        return self.astuple()
+
+    def __setstate__(self, values):
+        for key, value in zip(self.__slots__, values):
+            setattr(self, key, value)
+
+
+def polygon_vertices(cx, cy, radius, rotation, sides=6):
+    """Return the vertices of a regular polygon rotated by 'rotation' radians."""
+    step = 2 * math.pi / sides
+    return [
+        (cx + radius * math.cos(rotation + i * step), cy + radius * math.sin(rotation + i * step))
+        for i in range(sides)
+    ]
+
+
+class Simulation:
+    """
+    One ball inside a regular polygon spinning about its center.
+
+    Positions are in pixels with y pointing down, velocities in pixels per
+    second and ``angle`` in radians.  Subclasses hold the defaults and the
+    physics constants of the script they port; any constant listed in
+    ``PARAMS`` can be overridden by keyword.
+    """
+
+    name = None
+
+    # Geometry and initial state of the original script.
+    CENTER = (400.0, 300.0)
+    HEX_RADIUS = 200.0
+    BALL_RADIUS = 10.0
+    BALL_POS = (400.0, 300.0)
+    BALL_VEL = (0.0, 0.0)
+    SIDES = 6
+
+    # Physics constants of the original script, by their (lower-cased) names.
+    PARAMS = {}
+
+    # Collision mode -> method implementing step(dt) in that mode.
+    COLLISION_MODES = {
+        "discrete": "step_discrete",
+        "swept": "step_swept",
+        "local": "step_local",
+        "sector": "step_sector",
+    }
+
+    # Integrator -> method implementing integrate(dt).
+    INTEGRATORS = {
+        "script": "integrate",
+        "euler": "integrate_euler",
+        "verlet": "integrate_verlet",
+        "rk4": "integrate_rk4",
+    }
+
+    # Attribute holding the polygon's rotation, as saved in a WorldState.
+    STATE_ANGLE = "angle"
+
+    # The script's contact test, as :mod:`hexsim.kernel` names it.
+    CONTACT = "segment"
+
+    # Swept mode: impacts resolved per step, and the gap (pixels) that counts as touching.
+    MAX_IMPACTS = 8
+    CONTACT_TOLERANCE = 1e-6
+
+    def __init__(self, pos=None, vel=None, center=None, hex_radius=None,
+                 ball_radius=None, angle=0.0, sides=None, collision="discrete", integrator="script",
+                 container=None, **params):
+        unknown = sorted(set(params) - set(self.PARAMS))
+        if unknown:
+            raise TypeError(f"{type(self).__name__} got unexpected parameters: {', '.join(unknown)}")
+        if collision not in self.COLLISION_MODES:
+            raise ValueError(f"unknown collision mode {collision!r}; choose from {', '.join(self.COLLISION_MODES)}")
+        if integrator not in self.INTEGRATORS:
+            raise ValueError(f"unknown integrator {integrator!r}; choose from {', '.join(self.INTEGRATORS)}")
+        if integrator != "script" and collision not in ("local", "sector"):
+            raise ValueError(f"the {integrator!r} integrator needs collision='local' or 'sector'")
+        if container is not None and collision not in ("local", "sector"):
+            raise ValueError("a container needs collision='local' or 'sector'")
+
+        self.cx, self.cy = (float(c) for c in (center or self.CENTER))
+        self.hex_radius = float(self.HEX_RADIUS if hex_radius is None else hex_radius)
+        self.ball_radius = float(self.BALL_RADIUS if ball_radius is None else ball_radius)
+        self.sides = self.SIDES if sides is None else int(sides)
+        self.x, self.y = (float(c) for c in (pos or self.BALL_POS))
+        self.vx, self.vy = (float(c) for c in (vel or self.BALL_VEL))
+        self.angle = float(angle)
+        for key, default in self.PARAMS.items():
+            setattr(self, key, float(params.get(key, default)))
+
+        self.collision = collision
+        self.container = container
+        if container is not None:
+            if self.ball_radius > container.margin:
+                raise ValueError(f"the container's grid is built for balls up to radius {container.margin:g}")
+            self.sides, self.hex_radius = container.sides, container.radius
+            self.kernel = container
+        elif collision in ("local", "sector"):
+            self.kernel = rotating_polygon(self.sides, self.hex_radius)
+        self.integrator = integrator
+        if integrator != "script":
+            self.integrate = getattr(self, self.INTEGRATORS[integrator])
+        # Bound once so the hot loop pays no dispatch cost.
+        self.step = getattr(self, self.COLLISION_MODES[collision])
+
+        self.time = 0.0
+        self.steps = 0
+        self.bounces = 0
+
+    @property
+    def spin(self):
+        """Angular velocity of the polygon in radians per second."""
+        raise NotImplementedError
+
+    def vertices(self):
+        """Vertices of the polygon at the current angle, as the script builds them."""
+        return polygon_vertices(self.cx, self.cy, self.hex_radius, self.angle, self.sides)
+
+    def step(self, dt):
+        """Advance the simulation by 'dt' seconds. Returns True if the ball touched a wall."""
+        raise NotImplementedError  # replaced per instance by the collision mode's method
+
+    def step_discrete(self, dt):
+        """One step of the script's own physics."""
+        raise NotImplementedError
+
+    def accelerate(self, dt):
+        """Apply the script's gravity and damping to the velocity for one step."""
+        raise NotImplementedError
+
+    def integrate(self, dt):
+        """Move the ball through one step of free flight, in the script's order."""
+        self.accelerate(dt)
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+
+    @property
+    def drag(self):
+        """
+        The script's velocity damping as a continuous drag rate (1/s), taken
+        at the scripts' 60 frames per second; used by the "euler", "verlet"
+        and "rk4" integrators.
+        """
+        return 0.0
+
+    def acceleration(self, vx, vy):
+        """Gravity plus :attr:`drag` at velocity (vx, vy)."""
+        k = self.drag
+        return -k * vx, self.gravity - k * vy
+
+    def integrate_euler(self, dt):
+        """Semi-implicit Euler: velocity first, then position with the new velocity."""
+        ax, ay = self.acceleration(self.vx, self.vy)
+        self.vx += ax * dt
+        self.vy += ay * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+
+    def integrate_verlet(self, dt):
+        """
+        Velocity Verlet.  The drag depends on velocity, so the end-of-step
+        acceleration is taken at the Euler-predicted velocity.
+        """
+        vx, vy = self.vx, self.vy
+        ax, ay = self.acceleration(vx, vy)
+        self.x += (vx + 0.5 * ax * dt) * dt
+        self.y += (vy + 0.5 * ay * dt) * dt
+        ax1, ay1 = self.acceleration(vx + ax * dt, vy + ay * dt)
+        self.vx = vx + 0.5 * (ax + ax1) * dt
+        self.vy = vy + 0.5 * (ay + ay1) * dt
+
+    def integrate_rk4(self, dt):
+        """Classic fourth-order Runge-Kutta on position and velocity."""
+        acceleration = self.acceleration
+        half = 0.5 * dt
+        vx1, vy1 = self.vx, self.vy
+        ax1, ay1 = acceleration(vx1, vy1)
+        vx2, vy2 = vx1 + half * ax1, vy1 + half * ay1
+        ax2, ay2 = acceleration(vx2, vy2)
+        vx3, vy3 = vx1 + half * ax2, vy1 + half * ay2
+        ax3, ay3 = acceleration(vx3, vy3)
+        vx4, vy4 = vx1 + dt * ax3, vy1 + dt * ay3
+        ax4, ay4 = acceleration(vx4, vy4)
+        sixth = dt / 6
+        self.x += sixth * (vx1 + 2 * (vx2 + vx3) + vx4)
+        self.y += sixth * (vy1 + 2 * (vy2 + vy3) + vy4)
+        self.vx = vx1 + sixth * (ax1 + 2 * (ax2 + ax3) + ax4)
+        self.vy = vy1 + sixth * (ay1 + 2 * (ay2 + ay3) + ay4)
+
+    def respond(self, vx, vy, px, py, nx, ny):
+        """
+        The script's bounce response for a ball with velocity (vx, vy) touching
+        the wall at (px, py), where (nx, ny) is the unit normal pointing from
+        the wall into the polygon.  Returns ``(vx, vy, bounced)``.
+        """
+        raise NotImplementedError
+
+    def approaching(self, vx, vy, px, py, nx, ny):
+        """
+        True if a ball with velocity (vx, vy) touching the wall at (px, py),
+        with inward unit normal (nx, ny), is moving into the wall, as the
+        script's response judges it: relative to the turning wall.  Swept
+        mode only responds to approaching contacts.
+        """
+        w = self.spin
+        return (vx + w * (py - self.cy)) * nx + (vy - w * (px - self.cx)) * ny < 0
+
+    def snapshot(self):
+        """The current :class:`WorldState`."""
+        return WorldState(self.x, self.y, self.vx, self.vy, getattr(self, self.STATE_ANGLE),
+                          self.time, self.steps, self.bounces)
+
+    def restore(self, state):
+        """Continue from 'state' (a :class:`WorldState`); returns self."""
+        self.x, self.y, self.vx, self.vy = state.x, state.y, state.vx, state.vy
+        setattr(self, self.STATE_ANGLE, state.angle)
+        self.time, self.steps, self.bounces = state.time, state.steps, state.bounces
+        return self
+
+    def settings(self):
+        """Keyword arguments for :func:`create` that rebuild this simulation, minus its state."""
+        return {
+            "center": (self.cx, self.cy),
+            "hex_radius": self.hex_radius,
+            "ball_radius": self.ball_radius,
+            "sides": self.sides,
+            "collision": self.collision,
+            "integrator": self.integrator,
+            "container": self.container,
+            **{key: getattr(self, key) for key in self.PARAMS},
+        }
+
+    def run(self, steps, dt):
+        """Advance 'steps' fixed steps of 'dt' seconds and return self."""
+        step = self.step
+        for _ in range(steps):
+            step(dt)
+        return self
+
+    def energy(self):
+        """Mechanical energy per unit mass, with zero potential at the polygon's center."""
+        return 0.5 * (self.vx * self.vx + self.vy * self.vy) + self.gravity * (self.cy - self.y)
+
+    def facing_normal(self, dx, dy, angle):
+        """
+        Outward unit normal of the edge facing the point (dx, dy), given
+        relative to the center, when the polygon is rotated by 'angle'.
+        """
+        sector = 2 * math.pi / self.sides
+        # The facing edge is the one whose sector contains the polar angle.
+        k = math.floor((math.atan2(dy, dx) - angle) / sector)
+        normal_angle = angle + (k + 0.5) * sector
+        return math.cos(normal_angle), math.sin(normal_angle)
+
+    def gap(self, x, y, angle):
+        """
+        Clearance between a ball centered at (x, y) and the facing edge, with
+        the polygon at 'angle'; negative when overlapping.  Also returns that
+        edge's outward normal.
+        """
+        dx, dy = x - self.cx, y - self.cy
+        nx, ny = self.facing_normal(dx, dy, angle)
+        apothem = self.hex_radius * math.cos(math.pi / self.sides)
+        return apothem - self.ball_radius - (dx * nx + dy * ny), nx, ny
+
+    def is_outside(self):
+        """True if the ball's center has left the polygon."""
+        if self.container is not None:
+            return not self.container.holds(self)
+        return self.gap(self.x, self.y, self.angle)[0] < -self.ball_radius
+
+    # --- rotating-frame collision mode ---
+
+    def step_local(self, dt):
+        """One step with collisions resolved in the polygon's frame by the cached kernel."""
+        self.integrate(dt)
+        self.angle += self.spin * dt
+        collided = self.kernel.collide(self)
+        self.time += dt
+        self.steps += 1
+        return collided
+
+    def step_sector(self, dt):
+        """:meth:`step_local` testing only the edges in the ball's sector."""
+        self.integrate(dt)
+        self.angle += self.spin * dt
+        collided = self.kernel.collide_sector(self)
+        self.time += dt
+        self.steps += 1
+        return collided
+
+    # --- swept (continuous) collision mode ---
+
+    def step_swept(self, dt):
+        """One step with continuous collision detection against the rotating edges."""
+        self.accelerate(dt)
+        collided = self.sweep(dt)
+        self.time += dt
+        self.steps += 1
+        return collided
+
+    def sweep(self, dt):
+        """
+        Move the ball in a straight line for 'dt' seconds while the polygon
+        turns, stopping at each time of impact to apply :meth:`respond`.
+        Returns True if the ball touched a wall.
+        """
+        collided = False
+        remaining = dt
+        for _ in range(self.MAX_IMPACTS):
+            impact = self.time_of_impact(remaining)
+            if impact is None:
+                break
+            toi, nx, ny = impact
+            self.drift(toi)
+            remaining -= toi
+            # Contact point on the wall, and the inward normal there.
+            px, py = self.x + nx * self.ball_radius, self.y + ny * self.ball_radius
+            self.vx, self.vy, bounced = self.respond(self.vx, self.vy, px, py, -nx, -ny)
+            collided = True
+            if not bounced:
+                break
+        self.drift(remaining)
+
+        # Resting or sliding contact (and the rare step that runs out of
+        # impacts) is left to a positional correction; near a corner the
+        # first correction can leave the ball over the neighbouring edge.
+        for _ in range(2):
+            gap, nx, ny = self.gap(self.x, self.y, self.angle)
+            if gap >= 0:
+                break
+            self.x += nx * gap
+            self.y += ny * gap
+            collided = True
+        return collided
+
+    def drift(self, t):
+        """Advance the ball in a straight line and the polygon's rotation by 't' seconds."""
+        self.x += self.vx * t
+        self.y += self.vy * t
+        self.angle += self.spin * t
+
+    def time_of_impact(self, limit):
+        """
+        Earliest time in [0, limit] at which the ball, moving in a straight
+        line, touches an edge of the rotating polygon while moving into it.
+
+        Uses conservative advancement: the gap to the facing edge can shrink no
+        faster than the ball's speed plus the wall speed at the ball's farthest
+        reach, so stepping by gap / that bound never steps past a contact.
+        Returns ``(toi, nx, ny)`` with the edge's outward normal, or None.
+        """
+        x0, y0, vx, vy, angle0, w = self.x, self.y, self.vx, self.vy, self.angle, self.spin
+        speed = math.sqrt(vx * vx + vy * vy)
+        reach = math.sqrt((x0 - self.cx) ** 2 + (y0 - self.cy) ** 2) + speed * limit + self.ball_radius
+        bound = speed + abs(w) * reach
+        if bound == 0:
+            return None
+
+        t = 0.0
+        for _ in range(64):
+            x, y = x0 + vx * t, y0 + vy * t
+            gap, nx, ny = self.gap(x, y, angle0 + w * t)
+            if gap <= self.CONTACT_TOLERANCE:
+                # Touching: it is an impact only if the ball moves into the wall.
+                if self.approaching(vx, vy, x + nx * self.ball_radius, y + ny * self.ball_radius, -nx, -ny):
+                    return t, nx, ny
+                return None
+            t += gap / bound
+            if t > limit:
+                return None
+        return None
+
+
+class DeepSeekR1(Simulation):
+    """Port of deep-seek-r1-bouncing-ball-inside-hexagon.py."""
+
+    name = "deep-seek-r1"
+    CONTACT = "first"
+
+    HEX_RADIUS = 200.0
+    BALL_RADIUS = 10.0
+    BALL_POS = (400.0, 300.0 - 200.0 + 10.0 + 20.0)
+    BALL_VEL = (2.0, 0.0)
+
+    PARAMS = {
+        "gravity": 500.0,
+        "rotation_speed": 1.5,  # radians per second
+        "friction_coeff": 0.85,  # energy retention after bounce
+        "air_friction": 0.999,  # air resistance factor per 1/60 s
+    }
+
+    @property
+    def spin(self):
+        return self.rotation_speed
+
+    @property
+    def drag(self):
+        return -60 * math.log(self.air_friction)
+
+    def vertices(self):
+        cx, cy, radius, rotation = self.cx, self.cy, self.hex_radius, self.angle
+        step = 360 / self.sides
+        return [
+            (cx + radius * math.cos(math.radians(step * i) + rotation),
+             cy + radius * math.sin(math.radians(step * i) + rotation))
+            for i in range(self.sides)
+        ]
+
+    def accelerate(self, dt):
+        damping = self.air_friction ** (dt * 60)
+        self.vx = self.vx * damping
+        self.vy = (self.vy + self.gravity * dt) * damping
+
+    def respond(self, vx, vy, px, py, nx, ny):
+        w = self.rotation_speed
+        wall_vx, wall_vy = -w * (py - self.cy), w * (px - self.cx)
+        rel_vx, rel_vy = vx - wall_vx, vy - wall_vy
+
+        normal_vel = rel_vx * nx + rel_vy * ny
+        if normal_vel >= 0:
+            return vx, vy, False
+        tangent_x, tangent_y = rel_vx - nx * normal_vel, rel_vy - ny * normal_vel
+        rel_vx = tangent_x - normal_vel * self.friction_coeff * nx
+        rel_vy = tangent_y - normal_vel * self.friction_coeff * ny
+        self.bounces += 1
+        return rel_vx + wall_vx, rel_vy + wall_vy, True
+
+    def step_discrete(self, dt):
+        # The script derives the rotation from pygame.time.get_ticks(); here it
+        # is integrated from simulated time so runs are reproducible.
+        self.angle += self.rotation_speed * dt
+
+        damping = self.air_friction ** (dt * 60)
+        vx = self.vx * damping
+        vy = (self.vy + self.gravity * dt) * damping
+        x = self.x + vx * dt
+        y = self.y + vy * dt
+
+        cx, cy, r = self.cx, self.cy, self.ball_radius
+        vertices = self.vertices()
+        n = len(vertices)
+        collided = False
+        for i in range(n):
+            ax, ay = vertices[i]
+            bx, by = vertices[(i + 1) % n]
+
+            # closest_point_on_segment
+            abx, aby = bx - ax, by - ay
+            t = ((x - ax) * abx + (y - ay) * aby) / (abx * abx + aby * aby)
+            t = max(0, min(1, t))
+            px, py = ax + t * abx, ay + t * aby
+
+            distance = math.sqrt((x - px) ** 2 + (y - py) ** 2)
+            if distance < r:
+                length = math.sqrt(aby * aby + abx * abx)
+                nx, ny = aby / length, -abx / length
+                # Ensure normal points inward
+                if nx * (cx - (ax + bx) * 0.5) + ny * (cy - (ay + by) * 0.5) < 0:
+                    nx, ny = -nx, -ny
+
+                vx, vy, bounced = self.respond(vx, vy, px, py, nx, ny)
+                if bounced:
+                    penetration = r - distance
+                    x += nx * penetration * 1.1
+                    y += ny * penetration * 1.1
+                    collided = True
+                    break
+
+        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+        self.time += dt
+        self.steps += 1
+        return collided
+
+
+class O1(Simulation):
+    """
+    Port of o1-bouncing-ball-inside-hexagon.py.
+
+    The script keeps its angle in degrees (``current_angle``) and treats the
+    walls as static during a bounce; both are kept as-is.
+    """
+
+    name = "o1"
+    STATE_ANGLE = "current_angle"
+    CONTACT = "line"
+
+    HEX_RADIUS = 200.0
+    BALL_RADIUS = 15.0
+    BALL_POS = (400.0, 150.0)
+    BALL_VEL = (100.0, 0.0)
+
+    PARAMS = {
+        "gravity": 500.0,
+        "rotation_speed": 30.0,  # degrees per second
+        "air_friction": 0.0005,  # fraction of velocity lost each step
+        "bounce_friction": 0.9,  # fraction of velocity retained after bounce
+    }
+
+    @property
+    def angle(self):
+        return math.radians(self.current_angle)
+
+    @angle.setter
+    def angle(self, value):
+        self.current_angle = math.degrees(value) % 360
+
+    @property
+    def spin(self):
+        return math.radians(self.rotation_speed)
+
+    @property
+    def drag(self):
+        return -60 * math.log(1.0 - self.air_friction)
+
+    def vertices(self):
+        cx, cy, radius, angle_degrees = self.cx, self.cy, self.hex_radius, self.current_angle
+        step = 360 / self.sides
+        return [
+            (cx + radius * math.cos(math.radians(step * i + angle_degrees)),
+             cy + radius * math.sin(math.radians(step * i + angle_degrees)))
+            for i in range(self.sides)
+        ]
+
+    def accelerate(self, dt):
+        self.vy += self.gravity * dt
+        self.vx *= (1.0 - self.air_friction)
+        self.vy *= (1.0 - self.air_friction)
+
+    def approaching(self, vx, vy, px, py, nx, ny):
+        # The script's walls are static during a bounce.
+        return vx * nx + vy * ny < 0
+
+    def respond(self, vx, vy, px, py, nx, ny):
+        # reflect() about the edge normal, then bounce_friction
+        dot = vx * nx + vy * ny
+        self.bounces += 1
+        return (vx - 2 * dot * nx) * self.bounce_friction, (vy - 2 * dot * ny) * self.bounce_friction, True
+
+    def step_discrete(self, dt):
+        self.current_angle += self.rotation_speed * dt
+        self.current_angle %= 360
+
+        vx = self.vx
+        vy = self.vy + self.gravity * dt
+        vx *= (1.0 - self.air_friction)
+        vy *= (1.0 - self.air_friction)
+        x = self.x + vx * dt
+        y = self.y + vy * dt
+
+        r = self.ball_radius
+        vertices = self.vertices()
+        n = len(vertices)
+        collided = False
+        for i in range(n):
+            x1, y1 = vertices[i]
+            x2, y2 = vertices[(i + 1) % n]
+
+            # line_normal: the "right-hand" normal (ey, -ex) of the edge
+            ex, ey = x2 - x1, y2 - y1
+            length = math.sqrt(ey * ey + ex * ex)
+            if length == 0:
+                nx, ny = 0, 0
+            else:
+                nx, ny = ey / length, -ex / length
+
+            dist_to_line = (nx * x + ny * y) - (nx * x1 + ny * y1)
+            if 0 < dist_to_line < r:
+                penetration = r - dist_to_line
+                x -= nx * penetration
+                y -= ny * penetration
+                vx, vy, _ = self.respond(vx, vy, x1, y1, -nx, -ny)
+                collided = True
+
+        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+        self.time += dt
+        self.steps += 1
+        return collided
+
+
+class O3Mini(Simulation):
+    """Port of o3-mini-bouncing-ball-inside-hexagon.py."""
+
+    name = "o3-mini"
+
+    HEX_RADIUS = 250.0
+    BALL_RADIUS = 15.0
+    BALL_POS = (400.0, 300.0)
+    BALL_VEL = (200.0, -150.0)
+
+    PARAMS = {
+        "gravity": 500.0,
+        "velocity_damping": 0.999,  # a bit of air friction, applied each step
+        "restitution": 0.9,
+        "hex_angular_speed": 1.0,  # radians per second
+    }
+
+    @property
+    def spin(self):
+        return self.hex_angular_speed
+
+    @property
+    def drag(self):
+        return -60 * math.log(self.velocity_damping)
+
+    def accelerate(self, dt):
+        self.vy += self.gravity * dt
+        self.vx *= self.velocity_damping
+        self.vy *= self.velocity_damping
+
+    def integrate(self, dt):
+        # The script damps after moving.
+        self.vy += self.gravity * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.vx *= self.velocity_damping
+        self.vy *= self.velocity_damping
+
+    def step_swept(self, dt):
+        # As in integrate(): the sweep moves the ball at the undamped velocity.
+        self.vy += self.gravity * dt
+        collided = self.sweep(dt)
+        self.vx *= self.velocity_damping
+        self.vy *= self.velocity_damping
+        self.time += dt
+        self.steps += 1
+        return collided
+
+    def respond(self, vx, vy, px, py, nx, ny):
+        # wall_velocity_at_point, then reflect_velocity
+        w = self.hex_angular_speed
+        wall_vx, wall_vy = w * -(py - self.cy), w * (px - self.cx)
+        rel_vx, rel_vy = vx - wall_vx, vy - wall_vy
+        vn = rel_vx * nx + rel_vy * ny
+        if vn >= 0:
+            return vx, vy, False
+        rel_vx -= (1 + self.restitution) * vn * nx
+        rel_vy -= (1 + self.restitution) * vn * ny
+        self.bounces += 1
+        return wall_vx + rel_vx, wall_vy + rel_vy, True
+
+    def step_discrete(self, dt):
+        self.angle += self.hex_angular_speed * dt
+
+        vx = self.vx
+        vy = self.vy + self.gravity * dt
+        x = self.x + vx * dt
+        y = self.y + vy * dt
+        vx *= self.velocity_damping
+        vy *= self.velocity_damping
+
+        # handle_collisions
+        r = self.ball_radius
+        vertices = self.vertices()
+        n = len(vertices)
+        collided = False
+        for i in range(n):
+            ax, ay = vertices[i]
+            bx, by = vertices[(i + 1) % n]
+
+            # nearest_point_on_segment
+            abx, aby = bx - ax, by - ay
+            ab_length_sq = abx * abx + aby * aby
+            if ab_length_sq == 0:
+                px, py = ax, ay
+            else:
+                t = ((x - ax) * abx + (y - ay) * aby) / ab_length_sq
+                t = max(0, min(1, t))
+                px, py = ax + t * abx, ay + t * aby
+
+            dx, dy = x - px, y - py
+            dist = math.sqrt(dx * dx + dy * dy)
+            if dist < r:
+                collided = True
+                if dist == 0:
+                    nx, ny = 0.0, -1.0
+                else:
+                    nx, ny = dx / dist, dy / dist
+
+                vx, vy, _ = self.respond(vx, vy, px, py, nx, ny)
+
+                penetration = r - dist
+                x += nx * penetration
+                y += ny * penetration
+
+        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+        self.time += dt
+        self.steps += 1
+        return collided
+
+
+class O3MiniHigh(Simulation):
+    """Port of o3-mini-high-bouncing-ball-inside-hexagon.py."""
+
+    name = "o3-mini-high"
+
+    HEX_RADIUS = 250.0
+    BALL_RADIUS = 15.0
+    BALL_POS = (400.0, 200.0)
+    BALL_VEL = (200.0, 0.0)
+
+    PARAMS = {
+        "gravity": 500.0,
+        "restitution": 0.9,
+        "friction_coeff": 0.1,  # on the tangential component during collision
+        "angular_velocity": math.radians(30),
+    }
+
+    @property
+    def spin(self):
+        return self.angular_velocity
+
+    def accelerate(self, dt):
+        self.vy += self.gravity * dt
+
+    def respond(self, vx, vy, px, py, nx, ny):
+        # v = angular_velocity * (-r_y, r_x) at the contact point
+        w = self.angular_velocity
+        wall_vx, wall_vy = w * -(py - self.cy), w * (px - self.cx)
+        rel_vx, rel_vy = vx - wall_vx, vy - wall_vy
+
+        vn = rel_vx * nx + rel_vy * ny
+        if vn >= 0:
+            return vx, vy, False
+        normal_x, normal_y = nx * vn, ny * vn
+        tangent_x, tangent_y = rel_vx - normal_x, rel_vy - normal_y
+        keep = 1 - self.friction_coeff
+        self.bounces += 1
+        return (-self.restitution * normal_x + keep * tangent_x + wall_vx,
+                -self.restitution * normal_y + keep * tangent_y + wall_vy, True)
+
+    def step_discrete(self, dt):
+        vx = self.vx
+        vy = self.vy + self.gravity * dt
+        self.x += vx * dt
+        self.y += vy * dt
+        self.vx, self.vy = vx, vy
+
+        self.angle += self.angular_velocity * dt
+        vertices = self.vertices()
+        n = len(vertices)
+        collided = False
+        for i in range(n):
+            ax, ay = vertices[i]
+            bx, by = vertices[(i + 1) % n]
+            if self.collide_ball_with_segment(ax, ay, bx, by):
+                collided = True
+
+        self.time += dt
+        self.steps += 1
+        return collided
+
+    def collide_ball_with_segment(self, ax, ay, bx, by):
+        """
+        Check and resolve a collision between the ball and the segment AB,
+        responding in the wall's instantaneous reference frame.
+        """
+        x, y = self.x, self.y
+        abx, aby = bx - ax, by - ay
+        ab_length_sq = abx * abx + aby * aby
+        if ab_length_sq == 0:
+            return False
+
+        t = ((x - ax) * abx + (y - ay) * aby) / ab_length_sq
+        t = max(0, min(1, t))
+        px, py = ax + t * abx, ay + t * aby
+
+        dx, dy = x - px, y - py
+        distance = math.sqrt(dx * dx + dy * dy)
+        r = self.ball_radius
+        if distance >= r:
+            return False
+
+        penetration = r - distance
+        if distance != 0:
+            nx, ny = dx / distance, dy / distance
+        else:
+            nx, ny = 0.0, -1.0
+        self.x = x + nx * penetration
+        self.y = y + ny * penetration
+
+        self.vx, self.vy, _ = self.respond(self.vx, self.vy, px, py, nx, ny)
+        return True
+
+
+IMPLEMENTATIONS = {cls.name: cls for cls in (DeepSeekR1, O1, O3Mini, O3MiniHigh)}
+
+
+def create(name, **kwargs):
+    """Build the simulation for the script called 'name' (e.g. "o3-mini-high")."""
+    try:
+        cls = IMPLEMENTATIONS[name]
+    except KeyError:
+        raise ValueError(f"unknown implementation {name!r}; choose from {', '.join(IMPLEMENTATIONS)}") from None
+    return cls(**kwargs)
@@ -0,0 +1,199 @@
+"""
+Rotating-frame collision kernel with the polygon's geometry cached once.
+
+The scripts rebuild the polygon every step -- a cos/sin pair per vertex (two
+``math.radians`` calls per vertex in o1), a fresh list of vertices and a
+``normalize()`` per edge -- only to test one ball against it.  A rigid
+rotation doesn't change the polygon's shape, so :class:`RotatingPolygon`
+precomputes the unrotated vertices, edge vectors, outward normals and
+offsets once.  Each step it rotates just the ball into the polygon's frame
+with a single cos/sin pair, tests it against the fixed half-planes there,
+and rotates the ball back only when something touched.  The contact test
+itself is the script's own, picked by the simulation's ``CONTACT``:
+
+``"segment"`` (o3-mini, o3-mini-high)
+    Every edge in turn: closest point on the segment, push the ball out
+    along the contact normal, then ``respond()``.
+``"first"`` (DeepSeek)
+    The same closest-point test, but the ball is pushed out along the
+    edge's normal by 1.1 times the overlap, and only the first edge that
+    bounces it counts.
+``"line"`` (o1)
+    The signed distance of the ball's center beyond each edge's line: when
+    it lies in (0, r) the ball is pushed back by r minus that distance and
+    ``respond()`` reflects it, whichever way it was moving.
+
+:meth:`RotatingPolygon.collide` still visits every edge (cheaply, through a
+half-plane prefilter), so its cost grows with the side count.
+:meth:`RotatingPolygon.collide_sector` looks the edges up instead: for a
+regular polygon centered on the origin the edge a point penetrates deepest
+is the one whose normal is closest to the point's polar angle, so one
+``atan2`` picks that edge and its neighbour on the same side, and only those
+two are tested -- the same cost for a 1000-gon as for a hexagon.
+"""
+import math
+from functools import lru_cache
+
+
+class RotatingPolygon:
+    """
+    A regular polygon of 'sides' sides and circumradius 'radius', in its own
+    (unrotated) frame centered on the origin, with vertex 0 on the +x axis.
+    """
+
+    __slots__ = ("sides", "radius", "apothem", "edges", "sectors_per_radian")
+
+    def __init__(self, sides, radius):
+        self.sides = sides
+        self.radius = radius
+        self.apothem = radius * math.cos(math.pi / sides)
+        step = 2 * math.pi / sides
+        self.sectors_per_radian = 1 / step
+        vertices = [(radius * math.cos(i * step), radius * math.sin(i * step)) for i in range(sides)]
+        edges = []
+        for i in range(sides):
+            ax, ay = vertices[i]
+            bx, by = vertices[(i + 1) % sides]
+            abx, aby = bx - ax, by - ay
+            normal_angle = (i + 0.5) * step
+            nx, ny = math.cos(normal_angle), math.sin(normal_angle)
+            # start, edge vector, 1 / |edge|^2, outward normal, offset of the edge line
+            edges.append((ax, ay, abx, aby, 1.0 / (abx * abx + aby * aby), nx, ny, ax * nx + ay * ny))
+        self.edges = tuple(edges)
+
+    def collide(self, sim):
+        """
+        Resolve the ball of 'sim' against the polygon at ``sim.angle``, in place.
+
+        Applies the contact model of the script 'sim' ports (see above) to
+        every edge in turn, carried out in the polygon's frame.  The
+        response only depends on vectors relative to the center, so it is
+        the same in either frame.  Returns True if the ball touched a wall,
+        as the script's own step would.
+        """
+        r = sim.ball_radius
+        dx, dy = sim.x - sim.cx, sim.y - sim.cy
+        # Inside the inscribed circle shrunk by the ball: nothing to test.
+        clearance = self.apothem - r
+        if clearance > 0 and dx * dx + dy * dy < clearance * clearance:
+            return False
+
+        c, s = math.cos(sim.angle), math.sin(sim.angle)
+        return self.CONTACTS[sim.CONTACT](self, sim, self.edges, c * dx + s * dy, c * dy - s * dx, c, s)
+
+    def collide_sector(self, sim):
+        """
+        :meth:`collide` against only the edge facing the ball and its nearer
+        neighbour, found from the ball's polar angle in the polygon's frame.
+
+        The pair is tested in edge order, as :meth:`collide` would, so the
+        two agree whenever the ball can touch at most two edges (any polygon
+        whose edges are longer than the ball is wide).  On finer polygons
+        this resolves the deepest contact instead of every grazed edge.
+        """
+        r = sim.ball_radius
+        dx, dy = sim.x - sim.cx, sim.y - sim.cy
+        clearance = self.apothem - r
+        if clearance > 0 and dx * dx + dy * dy < clearance * clearance:
+            return False
+
+        c, s = math.cos(sim.angle), math.sin(sim.angle)
+        lx, ly = c * dx + s * dy, c * dy - s * dx
+        # Edge i spans polar angles [i, i + 1) * step; its normal sits at (i + 0.5) * step.
+        position = math.atan2(ly, lx) * self.sectors_per_radian - 0.5
+        facing = round(position)
+        n = self.sides
+        first, second = facing % n, (facing + 1 if position > facing else facing - 1) % n
+        if first > second:
+            first, second = second, first
+        edges = self.edges
+        return self.CONTACTS[sim.CONTACT](self, sim, (edges[first], edges[second]), lx, ly, c, s)
+
+    def _resolve(self, sim, edges, lx, ly, c, s):
+        """"segment" contact against 'edges' for the ball at (lx, ly) in the polygon's frame."""
+        r = sim.ball_radius
+        lvx = lvy = None
+        for ax, ay, abx, aby, inv_length_sq, nx, ny, offset in edges:
+            # Half-plane prefilter: far enough inside this edge's line.
+            if offset - (lx * nx + ly * ny) >= r:
+                continue
+
+            t = ((lx - ax) * abx + (ly - ay) * aby) * inv_length_sq
+            t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+            px, py = ax + t * abx, ay + t * aby
+            ddx, ddy = lx - px, ly - py
+            distance = math.sqrt(ddx * ddx + ddy * ddy)
+            if distance >= r:
+                continue
+
+            if distance != 0:
+                cnx, cny = ddx / distance, ddy / distance
+            else:
+                cnx, cny = -s, -c  # the scripts' fallback, straight up on screen
+            lx += cnx * (r - distance)
+            ly += cny * (r - distance)
+            if lvx is None:
+                lvx, lvy = c * sim.vx + s * sim.vy, c * sim.vy - s * sim.vx
+            lvx, lvy, _ = sim.respond(lvx, lvy, sim.cx + px, sim.cy + py, cnx, cny)
+
+        if lvx is None:
+            return False
+        sim.x, sim.y = sim.cx + c * lx - s * ly, sim.cy + s * lx + c * ly
+        sim.vx, sim.vy = c * lvx - s * lvy, s * lvx + c * lvy
+        return True
+
+    def _resolve_first(self, sim, edges, lx, ly, c, s):
+        """"first" contact: stop at the first edge whose response bounces the ball."""
+        r = sim.ball_radius
+        for ax, ay, abx, aby, inv_length_sq, nx, ny, offset in edges:
+            if offset - (lx * nx + ly * ny) >= r:
+                continue
+
+            t = ((lx - ax) * abx + (ly - ay) * aby) * inv_length_sq
+            t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+            px, py = ax + t * abx, ay + t * aby
+            ddx, ddy = lx - px, ly - py
+            distance = math.sqrt(ddx * ddx + ddy * ddy)
+            if distance >= r:
+                continue
+
+            lvx, lvy = c * sim.vx + s * sim.vy, c * sim.vy - s * sim.vx
+            lvx, lvy, bounced = sim.respond(lvx, lvy, sim.cx + px, sim.cy + py, -nx, -ny)
+            if bounced:
+                push = (r - distance) * 1.1
+                lx -= nx * push
+                ly -= ny * push
+                sim.x, sim.y = sim.cx + c * lx - s * ly, sim.cy + s * lx + c * ly
+                sim.vx, sim.vy = c * lvx - s * lvy, s * lvx + c * lvy
+                return True
+        return False
+
+    def _resolve_line(self, sim, edges, lx, ly, c, s):
+        """"line" contact: the center's signed distance beyond each edge's line."""
+        r = sim.ball_radius
+        lvx = lvy = None
+        for ax, ay, _, _, _, nx, ny, offset in edges:
+            beyond = lx * nx + ly * ny - offset
+            if not 0 < beyond < r:
+                continue
+
+            lx -= nx * (r - beyond)
+            ly -= ny * (r - beyond)
+            if lvx is None:
+                lvx, lvy = c * sim.vx + s * sim.vy, c * sim.vy - s * sim.vx
+            lvx, lvy, _ = sim.respond(lvx, lvy, sim.cx + ax, sim.cy + ay, -nx, -ny)
+
+        if lvx is None:
+            return False
+        sim.x, sim.y = sim.cx + c * lx - s * ly, sim.cy + s * lx + c * ly
+        sim.vx, sim.vy = c * lvx - s * lvy, s * lvx + c * lvy
+        return True
+
+    # Simulation.CONTACT -> the method resolving that script's contacts.
+    CONTACTS = {"segment": _resolve, "first": _resolve_first, "line": _resolve_line}
+
+
+@lru_cache(maxsize=None)
+def rotating_polygon(sides, radius):
+    """Shared, cached :class:`RotatingPolygon` for a given shape."""
+    return RotatingPolygon(sides, radius)
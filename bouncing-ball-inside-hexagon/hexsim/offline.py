@@ -0,0 +1,218 @@
+"""
+Offline rendering of runs to a PNG sequence or an animated GIF with Pillow.
+
+    python -m hexsim.offline --impl deep-seek-r1 --impl o1 --impl o3-mini --impl o3-mini-high \\
+        --seconds 20 --scale 0.5 --out compare.gif
+    python -m hexsim.offline --trajectory run.traj --fps 30 --out frames/
+
+Each source (a recorded trajectory, or an implementation run headlessly here)
+becomes one panel; panels are tiled into a grid so the implementations can be
+compared side by side.  Frames are rasterized and encoded in a process (or
+thread) pool.  Only a bounded window of frames is in flight at once and the
+results are written strictly in submission order, so memory stays flat however
+long the run is and the output never comes out shuffled.
+
+Frames are drawn straight into a four-colour palette image (background,
+outline, ball, label), which keeps them one byte per pixel and lets the GIF
+be streamed frame by frame with a single global palette.
+"""
+import argparse
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from PIL import GifImagePlugin, Image, ImageDraw
+
+from .engine import IMPLEMENTATIONS, create
+from .scene import BACKGROUND, BALL, HEIGHT, OUTLINE, WIDTH
+
+LABEL = (240, 240, 240)
+PALETTE = [*BACKGROUND, *OUTLINE, *BALL, *LABEL]
+BACKGROUND_INDEX, OUTLINE_INDEX, BALL_INDEX, LABEL_INDEX = range(4)
+
+
+def trajectory_frames(trajectory, fps, seconds=None):
+    """
+    Yield (angle, balls) for a recorded trajectory sampled at 'fps'.
+
+    Frame times only move forward, so a cursor walks the records once
+    instead of searching for each frame.
+    """
+    times = trajectory.records["time"]
+    if not len(times):
+        return
+    start, end = float(times[0]), float(times[-1])
+    if seconds is not None:
+        end = min(end, start + seconds)
+    index, last = 0, len(times) - 1
+    for k in range(int((end - start) * fps) + 1):
+        t = start + k / fps
+        while index < last and times[index + 1] <= t:
+            index += 1
+        record = trajectory[index]
+        yield float(record["angle"]), [(float(record["x"]), float(record["y"]))]
+
+
+def simulation_frames(sim, fps, seconds, substeps=1):
+    """Run 'sim' headlessly and yield (angle, balls) every 1/'fps' seconds."""
+    dt = 1.0 / (fps * substeps)
+    for _ in range(int(seconds * fps) + 1):
+        yield sim.angle, [(sim.x, sim.y)]
+        sim.run(substeps, dt)
+
+
+class Panel:
+    """Geometry and label of one tile; frames only carry angle and balls."""
+
+    def __init__(self, label, center, radius, ball_radius, sides):
+        self.label = label
+        self.center = center
+        self.radius = radius
+        self.ball_radius = ball_radius
+        self.sides = sides
+
+
+def blank_frame(size):
+    image = Image.new("P", size, BACKGROUND_INDEX)
+    image.putpalette(PALETTE)
+    return image
+
+
+def rasterize(panels, states, columns, scale):
+    """One palette image with every panel drawn at its state."""
+    panel_w, panel_h = round(WIDTH * scale), round(HEIGHT * scale)
+    rows = -(-len(panels) // columns)
+    image = blank_frame((panel_w * columns, panel_h * rows))
+    draw = ImageDraw.Draw(image)
+    width = max(1, round(3 * scale))
+    for k, (panel, (angle, balls)) in enumerate(zip(panels, states)):
+        ox, oy = (k % columns) * panel_w, (k // columns) * panel_h
+        cx, cy = panel.center
+        step = 2 * math.pi / panel.sides
+        points = [(ox + (cx + panel.radius * math.cos(angle + i * step)) * scale,
+                   oy + (cy + panel.radius * math.sin(angle + i * step)) * scale) for i in range(panel.sides)]
+        draw.polygon(points, outline=OUTLINE_INDEX, width=width)
+        r = panel.ball_radius * scale
+        for x, y in balls:
+            x, y = ox + x * scale, oy + y * scale
+            draw.ellipse((x - r, y - r, x + r, y + r), fill=BALL_INDEX)
+        if panel.label:
+            draw.text((ox + 8, oy + 8), panel.label, fill=LABEL_INDEX)
+    return image
+
+
+def render_frame(job):
+    """
+    Worker: rasterize one frame and encode it.  Writes a PNG and returns its
+    path, or returns the encoded GIF frame bytes when 'path' is None.
+    """
+    panels, states, columns, scale, path, duration = job
+    image = rasterize(panels, states, columns, scale)
+    if path is not None:
+        image.save(path, optimize=False, compress_level=1)
+        return path
+    return b"".join(GifImagePlugin.getdata(image, duration=duration))
+
+
+def gif_durations(fps):
+    """Per-frame GIF delays in ms; GIF counts centiseconds, so carry the rounding."""
+    elapsed = 0.0
+    shown = 0
+    while True:
+        elapsed += 100.0 / fps
+        delay = max(2, round(elapsed) - shown)
+        shown += delay
+        yield delay * 10
+
+
+def render(panels, frames, out, fps=30, scale=1.0, columns=None, workers=None, executor="process", window=None):
+    """
+    Render 'frames' (an iterable of per-panel state lists) to 'out'.
+
+    'out' ending in ``.gif`` writes an animated GIF; anything else is a
+    directory that receives ``frame_00000.png`` and so on.  At most 'window'
+    frames (default: four per worker) are queued or held at a time.
+    Returns the number of frames written.
+    """
+    columns = columns or min(len(panels), 2)
+    workers = workers or os.cpu_count() or 1
+    window = window or 4 * workers
+    gif = out.lower().endswith(".gif")
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+
+    if gif:
+        rows = -(-len(panels) // columns)
+        size = (round(WIDTH * scale) * columns, round(HEIGHT * scale) * rows)
+        header, _ = GifImagePlugin.getheader(blank_frame(size), info={"loop": 0, "optimize": False})
+        sink = open(out, "wb")
+        sink.write(b"".join(header))
+        durations = gif_durations(fps)
+    else:
+        os.makedirs(out, exist_ok=True)
+
+    written = 0
+    pending = deque()
+    try:
+        with pool_class(max_workers=workers) as pool:
+            def drain(limit):
+                nonlocal written
+                while len(pending) > limit:
+                    result = pending.popleft().result()
+                    if gif:
+                        sink.write(result)
+                    written += 1
+
+            for index, states in enumerate(frames):
+                path = None if gif else os.path.join(out, f"frame_{index:05d}.png")
+                duration = next(durations) if gif else None
+                pending.append(pool.submit(render_frame, (panels, states, columns, scale, path, duration)))
+                drain(window - 1)
+            drain(0)
+    finally:
+        if gif:
+            sink.write(b";")
+            sink.close()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.offline",
+                                     description="Render runs to a PNG sequence or an animated GIF.")
+    parser.add_argument("--impl", action="append", choices=sorted(IMPLEMENTATIONS), default=[],
+                        help="implementation to run headlessly (repeatable)")
+    parser.add_argument("--trajectory", action="append", default=[],
+                        help="recorded trajectory file to render (repeatable)")
+    parser.add_argument("--out", required=True, help="output .gif file, or directory for PNG frames")
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--seconds", type=float, help="length to render (default: 10, or whole trajectories)")
+    parser.add_argument("--substeps", type=int, default=2, help="physics steps per frame for --impl")
+    parser.add_argument("--scale", type=float, default=1.0, help="panel size relative to the 800x600 window")
+    parser.add_argument("--columns", type=int, help="panels per row (default: up to 2)")
+    parser.add_argument("--workers", type=int, help="pool size (default: CPU count)")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    args = parser.parse_args(argv)
+    if not args.impl and not args.trajectory:
+        parser.error("give at least one --impl or --trajectory")
+
+    panels, sources = [], []
+    for path in args.trajectory:
+        from .recording import Trajectory
+
+        trajectory = Trajectory(path)
+        panels.append(Panel(f"{trajectory.name} ({os.path.basename(path)})", trajectory.center,
+                            trajectory.hex_radius, trajectory.ball_radius, trajectory.sides))
+        sources.append(trajectory_frames(trajectory, args.fps, args.seconds))
+    for impl in args.impl:
+        sim = create(impl)
+        panels.append(Panel(impl, (sim.cx, sim.cy), sim.hex_radius, sim.ball_radius, sim.sides))
+        sources.append(simulation_frames(sim, args.fps, args.seconds or 10.0, args.substeps))
+
+    count = render(panels, zip(*sources), args.out, fps=args.fps, scale=args.scale, columns=args.columns,
+                   workers=args.workers, executor=args.executor)
+    print(f"wrote {count} frames to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
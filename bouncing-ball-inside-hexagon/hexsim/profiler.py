@@ -0,0 +1,164 @@
+"""
+Per-phase frame profiler for the main loops, with an on-screen HUD and a
+Chrome trace-event export.
+
+The loop calls :meth:`FrameProfiler.start_frame` at the top of every frame
+and :meth:`FrameProfiler.lap` after each phase; a lap is charged the time
+since the previous mark, so a frame costs one ``perf_counter_ns()`` and a
+couple of appends per phase.  F3 toggles the HUD (rolling percentiles over
+the last 'window' frames); its text is only re-rendered every
+'hud_interval' frames.
+
+Run a script or the viewer with ``--profile-trace PATH`` and the last
+'trace_events' phases are written as Chrome trace events when the window is
+closed; open the file in ``chrome://tracing`` or https://ui.perfetto.dev.
+"""
+import json
+import math
+import os
+import time
+from collections import deque
+
+TRACE_OPTION = "--profile-trace"
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+class FrameProfiler:
+    """
+    Times named phases of each frame.
+
+    'trace_path' enables the trace: phases are kept in a ring of
+    'trace_events' entries and written by :meth:`close`.
+    """
+
+    def __init__(self, window=300, hud_interval=15, trace_path=None, trace_events=1_000_000, show_hud=False):
+        self.window = window
+        self.hud_interval = hud_interval
+        self.trace_path = trace_path
+        self.show_hud = show_hud
+        self.frames = 0
+        self.samples = {}  # phase -> deque of the last 'window' durations (ns)
+        self._trace = deque(maxlen=trace_events) if trace_path else None
+        self._frame_start = None
+        self._last = None
+        self._hud = None
+        self._font = None
+        self._epoch = time.perf_counter_ns()
+
+    @classmethod
+    def from_argv(cls, argv, **kwargs):
+        """A profiler tracing to the path after ``--profile-trace`` in 'argv', if any."""
+        argv = list(argv)
+        if TRACE_OPTION in argv[:-1]:
+            kwargs.setdefault("trace_path", argv[argv.index(TRACE_OPTION) + 1])
+        return cls(**kwargs)
+
+    def start_frame(self):
+        """Close the previous frame (if any) and start timing a new one."""
+        now = time.perf_counter_ns()
+        if self._frame_start is not None:
+            self._record("frame", self._frame_start, now)
+            self.frames += 1
+            if self.frames % self.hud_interval == 0:
+                self._hud = None
+        self._frame_start = self._last = now
+
+    def lap(self, phase):
+        """Charge the time since the previous mark to 'phase'."""
+        now = time.perf_counter_ns()
+        if self._last is not None:
+            self._record(phase, self._last, now)
+        self._last = now
+
+    def _record(self, phase, start, end):
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+        samples.append(end - start)
+        if self._trace is not None:
+            self._trace.append((phase, start, end - start))
+
+    def stats(self):
+        """{phase: {"p50", "p95", "p99", "max"}} in milliseconds over the window."""
+        result = {}
+        for phase, samples in self.samples.items():
+            ordered = sorted(samples)
+            result[phase] = {q: percentile(ordered, n) / 1e6 for q, n in (("p50", 50), ("p95", 95), ("p99", 99))}
+            result[phase]["max"] = ordered[-1] / 1e6 if ordered else 0.0
+        return result
+
+    def handle_event(self, event):
+        """Toggle the HUD on F3; call for every pygame event."""
+        import pygame
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.show_hud = not self.show_hud
+            self._hud = None
+
+    def hud_surface(self):
+        """The HUD as a pygame surface, or None while it is hidden."""
+        if not self.show_hud:
+            return None
+        if self._hud is None:
+            self._hud = self._render_hud()
+        return self._hud
+
+    def draw_hud(self, screen, dest=(8, 8)):
+        """Blit the HUD onto 'screen' if it is shown; returns the rect or None."""
+        hud = self.hud_surface()
+        return screen.blit(hud, dest) if hud is not None else None
+
+    def _render_hud(self):
+        import pygame
+
+        if self._font is None:
+            # The bundled default font: no system font scan (which can itself stall a frame).
+            pygame.font.init()
+            self._font = pygame.font.Font(None, 18)
+        font = self._font
+        stats = self.stats()
+        rows = [("phase (ms)", "p50", "p95", "p99", "max")]
+        rows += [(phase, *(f"{s[q]:.2f}" for q in ("p50", "p95", "p99", "max"))) for phase, s in stats.items()]
+        cells = [[font.render(text, True, (240, 240, 240)) for text in row] for row in rows]
+        widths = [max(row[k].get_width() for row in cells) + 10 for k in range(len(rows[0]))]
+        frame = stats.get("frame", {}).get("p50", 0.0)
+        footer = font.render(f"{1000 / frame if frame else 0:.0f} fps over {len(self.samples.get('frame', ()))} "
+                             f"frames (F3 hides)", True, (240, 240, 240))
+
+        height = font.get_linesize()
+        surface = pygame.Surface((max(sum(widths), footer.get_width()) + 12, height * (len(cells) + 1) + 8))
+        surface.fill((0, 0, 0))
+        for k, row in enumerate(cells):
+            x = 6
+            for column, text in enumerate(row):
+                # Phase names left-aligned, numbers right-aligned.
+                surface.blit(text, (x if column == 0 else x + widths[column] - 10 - text.get_width(), 4 + k * height))
+                x += widths[column]
+        surface.blit(footer, (6, 4 + len(cells) * height))
+        return surface
+
+    def trace_events(self):
+        """The recorded phases as Chrome trace 'complete' events (microseconds)."""
+        if self._trace is None:
+            return []
+        pid = os.getpid()
+        return [{"name": phase, "cat": "frame" if phase == "frame" else "phase", "ph": "X",
+                 "ts": (start - self._epoch) / 1000, "dur": duration / 1000, "pid": pid,
+                 "tid": 0 if phase == "frame" else 1}
+                for phase, start, duration in self._trace]
+
+    def write_trace(self, path):
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+
+    def close(self):
+        """Write the trace, if one was requested."""
+        if self.trace_path:
+            self.write_trace(self.trace_path)
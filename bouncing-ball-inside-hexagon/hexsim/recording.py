@@ -0,0 +1,219 @@
+"""
+Compact binary trajectory files: record a run once, replay or analyse it later.
+
+    python -m hexsim.recording record --impl o3-mini-high --steps 216000 --out run.traj
+    python -m hexsim.recording info run.traj
+    python -m hexsim.recording replay run.traj --start 100000
+
+A file is a fixed 96-byte header followed by one fixed-size record per step
+(``RECORD``: time, hex angle, ball position and velocity, collision flags;
+36 bytes).  The recorder fills a preallocated NumPy buffer and writes it out
+in bulk.  :class:`Trajectory` memory-maps the records, so jumping to any step
+or time reads only the pages it touches and nothing is parsed up front.
+"""
+import argparse
+import bisect
+import struct
+import time
+
+import numpy as np
+
+from .engine import IMPLEMENTATIONS, Simulation, create
+
+MAGIC = b"HEXTRAJ\0"
+VERSION = 1
+
+# magic, version, header size, record size, sides, record count,
+# dt, center x, center y, polygon radius, ball radius, implementation name
+HEADER = struct.Struct("<8sHHHHQddddd32s")
+
+RECORD = np.dtype([
+    ("time", "<f8"),
+    ("angle", "<f8"),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("vx", "<f4"),
+    ("vy", "<f4"),
+    ("flags", "u1"),
+    ("_pad", "V3"),
+])
+
+# Bits of the flags field.
+COLLIDED = 1  # the step's collision pass touched a wall
+BOUNCED = 2  # the velocity response fired
+OUTSIDE = 4  # the ball's center ended the step outside the polygon
+
+
+class TrajectoryWriter:
+    """
+    Stream one record per step of a simulation into a trajectory file.
+
+    Use as a context manager, or call :meth:`close` to flush the buffer and
+    finalize the header.
+    """
+
+    def __init__(self, path, sim, dt, buffer_records=65536):
+        self.path = path
+        self.sim = sim
+        self.dt = dt
+        self.count = 0
+        self._buffer = np.zeros(buffer_records, dtype=RECORD)
+        self._fill = 0
+        self._bounces = sim.bounces
+        self._file = open(path, "wb")
+        self._file.write(self._header())
+
+    def _header(self):
+        sim = self.sim
+        return HEADER.pack(MAGIC, VERSION, HEADER.size, RECORD.itemsize, sim.sides, self.count,
+                           self.dt, sim.cx, sim.cy, sim.hex_radius, sim.ball_radius,
+                           (sim.name or "").encode()[:32])
+
+    def record(self, collided=False):
+        """Append the simulation's current state."""
+        sim = self.sim
+        flags = COLLIDED if collided else 0
+        if sim.bounces != self._bounces:
+            flags |= BOUNCED
+            self._bounces = sim.bounces
+        if sim.is_outside():
+            flags |= OUTSIDE
+        self._buffer[self._fill] = (sim.time, sim.angle, sim.x, sim.y, sim.vx, sim.vy, flags, b"")
+        self._fill += 1
+        self.count += 1
+        if self._fill == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        if self._fill:
+            self._file.write(self._buffer[:self._fill].tobytes())
+            self._fill = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record_run(sim, path, steps, dt, buffer_records=65536):
+    """Step 'sim' 'steps' times, recording the initial state and every step."""
+    with TrajectoryWriter(path, sim, dt, buffer_records) as writer:
+        writer.record()
+        step = sim.step
+        record = writer.record
+        for _ in range(steps):
+            record(step(dt))
+    return writer.count
+
+
+class Trajectory:
+    """
+    Read-only, memory-mapped view of a trajectory file.
+
+    Indexing returns records (or record arrays for slices) straight from the
+    map; fields are available as ``traj["x"]`` etc.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            raw = f.read(HEADER.size)
+        if len(raw) < HEADER.size or raw[:8] != MAGIC:
+            raise ValueError(f"{path} is not a trajectory file")
+        (_, version, header_size, record_size, self.sides, self.header_count, self.dt,
+         cx, cy, self.hex_radius, self.ball_radius, name) = HEADER.unpack(raw)
+        if version != VERSION or record_size != RECORD.itemsize:
+            raise ValueError(f"{path}: unsupported trajectory version {version} (record size {record_size})")
+        self.center = (cx, cy)
+        self.name = name.rstrip(b"\0").decode()
+        # The file size is authoritative, so a run cut short is still readable.
+        self.records = np.memmap(path, dtype=RECORD, mode="r", offset=header_size)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def index_at(self, t):
+        """
+        Index of the last record at or before simulated time 't'.
+
+        Records are a fixed 'dt' apart, so the first guess is computed from
+        the time and confirmed against its neighbours; only if that misses
+        (a run recorded with a varying step) does it fall back to a binary
+        search.  Either way only a handful of records are read, never the
+        whole time column.
+        """
+        times = self.records["time"]  # a strided view of the map, not a copy
+        last = len(times) - 1
+        if last < 0 or t < times[0]:
+            return 0
+        index = min(last, max(0, round((t - times[0]) / self.dt))) if self.dt > 0 else 0
+        if times[index] > t or (index < last and times[index + 1] <= t):
+            index = bisect.bisect_right(times, t) - 1
+        return index
+
+    def summary(self):
+        flags = self.records["flags"]
+        return {
+            "implementation": self.name,
+            "records": len(self),
+            "dt": self.dt,
+            "duration": float(self.records["time"][-1] - self.records["time"][0]) if len(self) else 0.0,
+            "steps_bouncing": int(np.count_nonzero(flags & BOUNCED)),
+            "steps_outside": int(np.count_nonzero(flags & OUTSIDE)),
+            "bytes": len(self) * RECORD.itemsize + HEADER.size,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.recording",
+                                     description="Record, inspect and replay trajectory files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="run headlessly and record every step")
+    rec.add_argument("--impl", choices=sorted(IMPLEMENTATIONS), default="o3-mini-high")
+    rec.add_argument("--steps", type=int, default=60 * 60)
+    rec.add_argument("--dt", type=float, default=1 / 60)
+    rec.add_argument("--collision", choices=list(Simulation.COLLISION_MODES), default="discrete")
+    rec.add_argument("--out", required=True)
+
+    info = commands.add_parser("info", help="print a trajectory's header and summary")
+    info.add_argument("path")
+
+    play = commands.add_parser("replay", help="play a trajectory back in a window")
+    play.add_argument("path")
+    play.add_argument("--start", type=int, default=0, help="first step to show")
+    play.add_argument("--speed", type=float, default=1.0, help="playback speed multiplier")
+    play.add_argument("--renderer", choices=["full", "dirty", "bulk"], default="full")
+    play.add_argument("--fps", type=int, default=60)
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        sim = create(args.impl, collision=args.collision)
+        start = time.perf_counter()
+        count = record_run(sim, args.out, args.steps, args.dt)
+        elapsed = time.perf_counter() - start
+        print(f"recorded {count} steps to {args.out} in {elapsed:.2f} s ({count * RECORD.itemsize / 1e6:.1f} MB)")
+    elif args.command == "info":
+        for key, value in Trajectory(args.path).summary().items():
+            print(f"{key}: {value}")
+    else:
+        from .viewer import replay
+
+        replay(Trajectory(args.path), start=args.start, speed=args.speed, renderer=args.renderer, fps=args.fps)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,284 @@
+"""
+Pygame renderers for the spinning polygon and its balls.
+
+:class:`FullRenderer` repaints the whole window every frame, like the scripts
+do (``screen.fill``, ``draw.polygon``, ``draw.circle``, ``display.flip``).
+
+:class:`DirtyRectRenderer` only repaints what changed and hands those
+rectangles to ``pygame.display.update``:
+
+- the polygon outline is pre-rendered into sprites kept in an LRU cache keyed
+  by its rotation quantized within one symmetry sector (a regular polygon
+  looks the same every ``2*pi/sides``), and is only redrawn when the
+  quantized angle changes;
+- each ball is a pre-rendered sprite blitted in place of ``draw.circle``;
+- a ball's previous position is erased by copying that patch back from the
+  (opaque) outline sprite, or from a cached background outside it.
+
+On a window where the polygon turns slowly most frames only touch a few
+ball-sized rectangles instead of flipping the full surface.
+
+:class:`BulkRenderer` is for crowds of thousands of balls, where one
+``draw.circle`` per ball costs more than the physics.  It counts the balls'
+centers per pixel with one ``bincount``, spreads the counts over a disc
+stamp with prefix sums (two array operations per stamp row, however many
+balls there are), maps the counts through a colour table -- optionally
+shading by how many balls overlap -- into a ``surfarray`` buffer, and blits
+that layer once.
+
+All three draw a regular polygon of 'sides' sides, or the outline 'loops' of a
+:class:`~hexsim.container.MeshContainer` when given.
+"""
+import math
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from .scene import BACKGROUND, BALL, OUTLINE
+
+
+class FullRenderer:
+    """Repaint everything and flip, as the scripts do."""
+
+    def __init__(self, screen, center, radius, ball_radius, sides=6, width=3,
+                 background=BACKGROUND, outline=OUTLINE, ball=BALL, loops=None):
+        self.screen = screen
+        self.center = center
+        self.radius = radius
+        self.ball_radius = int(ball_radius)
+        self.sides = sides
+        self.width = width
+        self.background, self.outline, self.ball = background, outline, ball
+        self.loops = loops
+
+    def draw(self, angle, balls):
+        """Draw the polygon at 'angle' and a ball at every (x, y) in 'balls'."""
+        self.present(self.paint(angle, balls))
+
+    def polygons(self, cx, cy, angle):
+        """The point lists to outline: the polygon (or each loop) rotated by 'angle' about (cx, cy)."""
+        if self.loops is not None:
+            c, s = math.cos(angle), math.sin(angle)
+            return [[(cx + c * x - s * y, cy + s * x + c * y) for x, y in loop] for loop in self.loops]
+        step = 2 * math.pi / self.sides
+        return [[(cx + self.radius * math.cos(angle + i * step), cy + self.radius * math.sin(angle + i * step))
+                 for i in range(self.sides)]]
+
+    def paint(self, angle, balls):
+        """Draw the frame to the screen surface without showing it; returns the dirty rects."""
+        self.screen.fill(self.background)
+        for points in self.polygons(*self.center, angle):
+            pygame.draw.polygon(self.screen, self.outline, points, self.width)
+        for x, y in balls:
+            pygame.draw.circle(self.screen, self.ball, (int(x), int(y)), self.ball_radius)
+        return None
+
+    def overlay(self, surface, dest):
+        """Blit 'surface' (a HUD, say) over the painted frame."""
+        return self.screen.blit(surface, dest)
+
+    def present(self, dirty):
+        """Show what :meth:`paint` and :meth:`overlay` drew."""
+        pygame.display.flip()
+
+
+class DirtyRectRenderer(FullRenderer):
+    """
+    Repaint only the changed rectangles, with cached outline and ball sprites.
+
+    'angle_steps' is the number of distinct outline sprites per symmetry
+    sector, and 'cache_size' bounds how many are kept.  An outline given as
+    'loops' has no symmetry: its sector is the full turn.
+    """
+
+    def __init__(self, screen, center, radius, ball_radius, sides=6, width=3,
+                 background=BACKGROUND, outline=OUTLINE, ball=BALL, loops=None,
+                 angle_steps=60, cache_size=128):
+        super().__init__(screen, center, radius, ball_radius, sides, width, background, outline, ball, loops)
+        self.sector = 2 * math.pi if loops is not None else 2 * math.pi / sides
+        self.angle_steps = angle_steps
+        self.cache_size = cache_size
+        self._sprites = OrderedDict()
+
+        self._backdrop = pygame.Surface(screen.get_size()).convert()
+        self._backdrop.fill(background)
+
+        size = 2 * self.ball_radius + 1
+        self._ball_sprite = pygame.Surface((size, size), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(self._ball_sprite, ball, (self.ball_radius, self.ball_radius), self.ball_radius)
+
+        extent = int(math.ceil(radius)) + width + 1
+        self._polygon_rect = pygame.Rect(0, 0, 2 * extent, 2 * extent)
+        self._polygon_rect.center = (round(center[0]), round(center[1]))
+
+        self._bucket = None
+        self._ball_rects = []
+        self._overlay_rects = []
+        screen.blit(self._backdrop, (0, 0))
+        pygame.display.flip()
+
+    def quantize(self, angle):
+        """Index of the outline sprite for 'angle'."""
+        sector = self.sector
+        return round((angle % sector) / sector * self.angle_steps) % self.angle_steps
+
+    def polygon_sprite(self, bucket):
+        """The outline at the bucket's angle, from the LRU cache."""
+        sprite = self._sprites.get(bucket)
+        if sprite is not None:
+            self._sprites.move_to_end(bucket)
+            return sprite
+
+        angle = bucket / self.angle_steps * self.sector
+        rect = self._polygon_rect
+        half = rect.width / 2
+        # Opaque, background included, so blitting it also erases the old outline.
+        sprite = pygame.Surface(rect.size).convert()
+        sprite.fill(self.background)
+        for points in self.polygons(half, half, angle):
+            pygame.draw.polygon(sprite, self.outline, points, self.width)
+
+        self._sprites[bucket] = sprite
+        if len(self._sprites) > self.cache_size:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def paint(self, angle, balls):
+        screen = self.screen
+        dirty = []
+
+        bucket = self.quantize(angle)
+        sprite = self.polygon_sprite(bucket)
+        polygon_changed = bucket != self._bucket
+        self._bucket = bucket
+        polygon_rect = self._polygon_rect
+        if polygon_changed:
+            screen.blit(sprite, polygon_rect)
+            dirty.append(polygon_rect)
+
+        # Erase the balls and overlays where they were, restoring any outline underneath.
+        for rect in self._ball_rects + self._overlay_rects:
+            if polygon_changed and polygon_rect.contains(rect):
+                continue  # already repainted with the polygon
+            if not polygon_rect.contains(rect):
+                screen.blit(self._backdrop, rect, rect)
+            overlap = rect.clip(polygon_rect)
+            if overlap:
+                screen.blit(sprite, overlap, overlap.move(-polygon_rect.x, -polygon_rect.y))
+            dirty.append(rect)
+
+        r = self.ball_radius
+        self._ball_rects = [screen.blit(self._ball_sprite, (int(x) - r, int(y) - r)) for x, y in balls]
+        dirty.extend(self._ball_rects)
+        self._overlay_rects = []
+        return dirty
+
+    def overlay(self, surface, dest):
+        rect = self.screen.blit(surface, dest)
+        self._overlay_rects.append(rect)
+        return rect
+
+    def present(self, dirty):
+        pygame.display.update(dirty + self._overlay_rects)
+
+
+class BulkRenderer(FullRenderer):
+    """
+    Draw every ball at once through a pixel array; 'balls' may be an
+    ``(N, 2)`` array.
+
+    With 'density' on, a pixel covered by k balls is shaded from the ball
+    colour (k = 1) towards 'hot' (k >= 'saturation'); otherwise every
+    covered pixel gets the ball colour.  Only the bounding box of the balls
+    is processed.
+    """
+
+    def __init__(self, screen, center, radius, ball_radius, sides=6, width=3,
+                 background=BACKGROUND, outline=OUTLINE, ball=BALL, loops=None,
+                 density=True, saturation=8, hot=(255, 255, 160)):
+        super().__init__(screen, center, radius, ball_radius, sides, width, background, outline, ball, loops)
+        self.size = screen.get_size()
+        self._rows = self.stamp_rows(self.ball_radius)
+
+        levels = saturation if density and saturation > 1 else 1
+        ramp = np.linspace(0.0, 1.0, levels)[:, None] if levels > 1 else np.zeros((1, 1))
+        low, high = np.asarray(ball, float), np.asarray(hot, float)
+        colours = np.rint(low + ramp * (high - low)).astype(np.uint8)
+        key = (1, 0, 1) if (colours == 0).all(axis=1).any() else (0, 0, 0)
+        self._lut = np.vstack([np.array([key], np.uint8), colours])
+        self._key = key
+        self._layer = pygame.Surface(self.size).convert()
+        self._layer.set_colorkey(key)
+
+    @staticmethod
+    def stamp_rows(r):
+        """
+        The pixels ``pygame.draw.circle`` fills for radius 'r', as
+        ``(dy, first dx, last dx)`` runs, so the splat matches it exactly.
+        """
+        size = 2 * r + 1
+        stamp = pygame.Surface((size, size))
+        pygame.draw.circle(stamp, (255, 255, 255), (r, r), r)
+        mask = pygame.surfarray.array_red(stamp) > 0  # indexed [x, y]
+        rows = []
+        for y in range(size):
+            xs = np.flatnonzero(mask[:, y])
+            if len(xs):
+                rows.append((y - r, int(xs[0]) - r, int(xs[-1]) - r))
+        return rows
+
+    def splat(self, balls):
+        """
+        Per-pixel count of the balls covering it, capped at the colour
+        table's top level, over the region they cover; returns
+        ``(counts, (x0, y0))``, or None if no ball is on screen.
+        """
+        w, h = self.size
+        r = self.ball_radius
+        pos = np.asarray(balls, dtype=float).reshape(-1, 2)
+        # Truncate like int() in FullRenderer.
+        x = pos[:, 0].astype(np.intp)
+        y = pos[:, 1].astype(np.intp)
+        keep = (x > -r - 1) & (x < w + r) & (y > -r - 1) & (y < h + r)
+        x, y = x[keep], y[keep]
+        if not len(x):
+            return None
+        x0, x1 = max(int(x.min()) - r, 0), min(int(x.max()) + r + 1, w)
+        y0, y1 = max(int(y.min()) - r, 0), min(int(y.max()) + r + 1, h)
+        if x0 >= x1 or y0 >= y1:
+            return None
+
+        # Centers on a grid padded by r around the region [x0, x1) x [y0, y1).
+        rw, rh = x1 - x0, y1 - y0
+        pw, ph = rw + 2 * r, rh + 2 * r
+        centers = np.bincount((x - x0 + r) * ph + (y - y0 + r), minlength=pw * ph).reshape(pw, ph)
+        # sums[k] = centers[:k].sum(axis=0), so each stamp row is one subtraction.
+        sums = np.zeros((pw + 1, ph), np.int32)
+        np.cumsum(centers, axis=0, out=sums[1:])
+
+        counts = np.zeros((rw, rh), np.int32)
+        for dy, first, last in self._rows:
+            # Pixel i is covered by centers at i - last .. i - first.
+            columns = slice(r - dy, r - dy + rh)
+            counts += sums[r - first + 1:r - first + 1 + rw, columns]
+            counts -= sums[r - last:r - last + rw, columns]
+        np.minimum(counts, len(self._lut) - 1, out=counts)
+        return counts, (x0, y0)
+
+    def paint(self, angle, balls):
+        self.screen.fill(self.background)
+        for points in self.polygons(*self.center, angle):
+            pygame.draw.polygon(self.screen, self.outline, points, self.width)
+
+        splat = self.splat(balls)
+        if splat is None:
+            return None
+        counts, (x0, y0) = splat
+        region = pygame.Rect((x0, y0), counts.shape)
+        pygame.surfarray.blit_array(self._layer.subsurface(region), np.take(self._lut, counts, axis=0))
+        self.screen.blit(self._layer, region, region)
+        return None
+
+
+RENDERERS = {"full": FullRenderer, "dirty": DirtyRectRenderer, "bulk": BulkRenderer}
@@ -0,0 +1,202 @@
+"""
+Allocation-free single-ball step for o3-mini-high.
+
+    python -m hexsim.scalar --steps 1000000
+
+The script's ``collide_ball_with_segment`` builds nine ``Vector2``
+temporaries per edge per step, and even the float ports in
+:mod:`hexsim.engine` still create a few heap objects per step: step and
+bounce counters past 256 are fresh ints, every ``for`` over the edge tuple
+creates an iterator, and each nested call (``integrate``, ``collide``,
+``respond``) can push a new frame chunk.  In a loop that does nothing else,
+that churn is a good part of the cost.
+
+:class:`ScalarO3MiniHigh` performs the whole step -- gravity, move, rotate,
+rotating-frame contact against the cached edges of
+:func:`~hexsim.kernel.rotating_polygon`, response -- in one method on
+``__slots__`` state.  Only floats (recycled by CPython's float free list)
+and small ints are created, the counters are kept as floats, and the edges
+are walked by index.  The arithmetic is the ``"local"`` collision mode's,
+in the same order, so results are identical to
+``create("o3-mini-high", collision="local")`` (and match ``"discrete"`` up
+to rounding).  The zero-allocation guarantee holds for up to 256 sides,
+where edge indices are still cached small ints.
+"""
+import argparse
+import math
+import time
+import tracemalloc
+from itertools import repeat
+
+from .engine import O3MiniHigh, WorldState, create
+from .kernel import rotating_polygon
+
+
+class ScalarO3MiniHigh:
+    """The state and constants of an :class:`~hexsim.engine.O3MiniHigh`, stepped without allocating."""
+
+    __slots__ = (
+        "x", "y", "vx", "vy", "angle", "time", "step_count", "bounce_count",
+        "cx", "cy", "ball_radius", "gravity", "restitution", "keep", "angular_velocity",
+        "clearance_sq", "edges", "sides",
+    )
+
+    def __init__(self, sim=None):
+        sim = sim or O3MiniHigh()
+        if not isinstance(sim, O3MiniHigh) or sim.integrator != "script" or sim.container is not None:
+            raise ValueError("the scalar kernel implements o3-mini-high's own physics only")
+        self.cx, self.cy = sim.cx, sim.cy
+        self.ball_radius = sim.ball_radius
+        self.gravity = sim.gravity
+        self.restitution = sim.restitution
+        self.keep = 1 - sim.friction_coeff
+        self.angular_velocity = sim.angular_velocity
+        polygon = rotating_polygon(sim.sides, sim.hex_radius)
+        clearance = polygon.apothem - sim.ball_radius
+        # Inside the inscribed circle shrunk by the ball nothing can touch; -1 disables the shortcut.
+        self.clearance_sq = clearance * clearance if clearance > 0 else -1.0
+        self.edges = polygon.edges
+        self.sides = sim.sides
+        self.restore(sim.snapshot())
+
+    @property
+    def steps(self):
+        return int(self.step_count)
+
+    @property
+    def bounces(self):
+        return int(self.bounce_count)
+
+    def snapshot(self):
+        return WorldState(self.x, self.y, self.vx, self.vy, self.angle, self.time, self.steps, self.bounces)
+
+    def restore(self, state):
+        self.x, self.y, self.vx, self.vy = state.x, state.y, state.vx, state.vy
+        self.angle, self.time = state.angle, state.time
+        self.step_count, self.bounce_count = float(state.steps), float(state.bounces)
+        return self
+
+    def energy(self):
+        return 0.5 * (self.vx * self.vx + self.vy * self.vy) + self.gravity * (self.cy - self.y)
+
+    def step(self, dt):
+        """Advance by 'dt' seconds. Returns True if the ball touched a wall."""
+        self.vy += self.gravity * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.angle += self.angular_velocity * dt
+        self.time += dt
+        self.step_count += 1.0
+
+        cx, cy = self.cx, self.cy
+        dx, dy = self.x - cx, self.y - cy
+        if dx * dx + dy * dy < self.clearance_sq:
+            return False
+
+        r = self.ball_radius
+        c, s = math.cos(self.angle), math.sin(self.angle)
+        lx, ly = c * dx + s * dy, c * dy - s * dx
+        touched = False
+        lvx = lvy = 0.0
+        edges = self.edges
+        i = 0
+        n = self.sides
+        while i < n:
+            ax, ay, abx, aby, inv_length_sq, nx, ny, offset = edges[i]
+            i += 1
+            if offset - (lx * nx + ly * ny) >= r:
+                continue
+
+            t = ((lx - ax) * abx + (ly - ay) * aby) * inv_length_sq
+            t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+            px, py = ax + t * abx, ay + t * aby
+            ddx, ddy = lx - px, ly - py
+            distance = math.sqrt(ddx * ddx + ddy * ddy)
+            if distance >= r:
+                continue
+
+            if distance != 0:
+                cnx, cny = ddx / distance, ddy / distance
+            else:
+                cnx, cny = -nx, -ny
+            lx += cnx * (r - distance)
+            ly += cny * (r - distance)
+            if not touched:
+                touched = True
+                lvx, lvy = c * self.vx + s * self.vy, c * self.vy - s * self.vx
+
+            # Response in the wall's frame, as O3MiniHigh.respond() computes it.
+            w = self.angular_velocity
+            wall_vx, wall_vy = w * -((cy + py) - cy), w * ((cx + px) - cx)
+            rel_vx, rel_vy = lvx - wall_vx, lvy - wall_vy
+            vn = rel_vx * cnx + rel_vy * cny
+            if vn >= 0:
+                continue
+            normal_x, normal_y = cnx * vn, cny * vn
+            tangent_x, tangent_y = rel_vx - normal_x, rel_vy - normal_y
+            keep = self.keep
+            lvx = -self.restitution * normal_x + keep * tangent_x + wall_vx
+            lvy = -self.restitution * normal_y + keep * tangent_y + wall_vy
+            self.bounce_count += 1.0
+
+        if not touched:
+            return False
+        self.x, self.y = cx + c * lx - s * ly, cy + s * lx + c * ly
+        self.vx, self.vy = c * lvx - s * lvy, s * lvx + c * lvy
+        return True
+
+    def run(self, steps, dt):
+        step = self.step
+        for _ in repeat(None, steps):
+            step(dt)
+        return self
+
+
+def transient_bytes(step, dt, steps):
+    """
+    Heap bytes ``step(dt)`` allocates over 'steps' calls, as tracemalloc sees
+    them: ``(still held, peak above the start)``.  Call it on a warmed-up
+    step; the cyclic GC is paused meanwhile.
+    """
+    import gc
+
+    enabled = gc.isenabled()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        calls = repeat(None, steps)
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for _ in calls:
+            step(dt)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        if enabled:
+            gc.enable()
+    return current - start, peak - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.scalar",
+                                     description="Time the allocation-free o3-mini-high step.")
+    parser.add_argument("--steps", type=int, default=1_000_000)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    args = parser.parse_args(argv)
+
+    print(f"{'step':<10}{'steps/s':>14}{'held B':>9}{'peak B':>9}")
+    for mode in ("discrete", "local", "scalar"):
+        sim = create("o3-mini-high", collision="local" if mode == "scalar" else mode)
+        if mode == "scalar":
+            sim = ScalarO3MiniHigh(sim)
+        sim.run(1000, args.dt)
+        held, peak = transient_bytes(sim.step, args.dt, 10_000)
+        start = time.perf_counter()
+        sim.run(args.steps, args.dt)
+        rate = args.steps / (time.perf_counter() - start)
+        print(f"{mode:<10}{rate:>14,.0f}{held:>9}{peak:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
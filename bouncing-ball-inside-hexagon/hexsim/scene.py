@@ -0,0 +1,12 @@
+"""
+Window size and colours shared by the front ends.
+
+Kept apart from :mod:`hexsim.render` and :mod:`hexsim.viewer` so that code
+which only needs the numbers (the Pillow renderer in :mod:`hexsim.offline`
+and its worker processes) doesn't have to import pygame.
+"""
+WIDTH, HEIGHT = 800, 600
+
+BACKGROUND = (30, 30, 30)
+OUTLINE = (200, 200, 200)
+BALL = (255, 100, 100)
@@ -0,0 +1,422 @@
+"""
+Physics and rendering in separate processes, joined by a lock-free frame
+ring in shared memory.
+
+    python -m hexsim --impl o3-mini-high --split --physics-hz 1000
+    python -m hexsim.split window --balls 2000 --renderer bulk
+    python -m hexsim.split demo --seconds 5 --stall-ms 250
+
+In the scripts (and :mod:`hexsim.viewer`) physics and drawing share one
+thread: a slow ``display.flip()`` holds the physics up -- past the viewer's
+catch-up cap, simulated time is dropped -- and a slow physics step delays
+the next frame.  In split mode a simulation process steps at its own fixed
+rate and publishes every batch of steps into a :class:`FrameRing`, and the
+window process draws the newest complete frame whenever it is ready for
+one.
+
+The ring is one ``multiprocessing.shared_memory`` block of 'slots' frames
+(time, polygon angle, step count and the ball positions as NumPy arrays)
+plus a few control words.  There is one writer and one reader and no lock:
+
+- the writer fills a slot that is neither the newest frame nor the one the
+  reader holds, bracketing the write with a per-slot sequence number (odd
+  while writing, ``2 * frame + 2`` when complete), then publishes the
+  frame's number and slot in a single 8-byte word;
+- the reader claims the newest slot, checks its sequence number and draws
+  straight from views of the shared arrays -- nothing is copied or
+  pickled -- and on release checks the sequence number again.
+
+With three or more slots the writer never has to wait for the reader.  The
+one race left, a claim made just as the writer picks that slot, shows up as
+a changed sequence number on release, and the frame is counted as torn;
+:func:`show` then draws the next newest frame in its place, so a torn frame
+is never presented.
+"""
+import argparse
+import math
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .arenas import views
+from .timestep import FixedTimestep
+
+# Control words: newest frame (frame * slots + slot, -1 before the first),
+# slot held by the reader (-1 for none), stop request.
+LATEST, READING, STOP = range(3)
+
+
+def layout(balls, slots):
+    """Name -> (dtype, shape, byte offset) of every array in the ring's block, and its size."""
+    fields = [
+        ("control", np.int64, (3,)),
+        ("sequence", np.int64, (slots,)),
+        ("time", np.float64, (slots,)),
+        ("angle", np.float64, (slots,)),
+        ("steps", np.int64, (slots,)),
+        ("positions", np.float64, (slots, balls, 2)),
+    ]
+    result, offset = {}, 0
+    for name, dtype, shape in fields:
+        offset = -(-offset // 8) * 8
+        result[name] = (np.dtype(dtype).str, shape, offset)
+        offset += np.dtype(dtype).itemsize * math.prod(shape)
+    return result, max(offset, 1)
+
+
+class Frame:
+    """A frame held by the reader; 'positions' is a view into shared memory, valid until released."""
+
+    __slots__ = ("number", "slot", "time", "angle", "steps", "positions")
+
+    def __init__(self, number, slot, time, angle, steps, positions):
+        self.number, self.slot = number, slot
+        self.time, self.angle, self.steps = time, angle, steps
+        self.positions = positions
+
+
+class FrameRing:
+    """
+    A single-writer, single-reader ring of 'slots' frames of 'balls' ball
+    positions.  Without 'name' a new block is created (and unlinked by
+    :meth:`close`); with it, the existing block is attached.
+    """
+
+    def __init__(self, balls, slots=3, name=None):
+        if slots < 3:
+            raise ValueError("the ring needs at least 3 slots")
+        self.balls, self.slots = balls, slots
+        self.owner = name is None
+        fields, size = layout(balls, slots)
+        self._block = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        arrays = views(self._block.buf, fields)
+        self.control, self.sequence = arrays["control"], arrays["sequence"]
+        self.time, self.angle, self.steps = arrays["time"], arrays["angle"], arrays["steps"]
+        self.positions = arrays["positions"]
+        if self.owner:
+            self.control[:] = (-1, -1, 0)
+            self.sequence[:] = 0
+        self.published = 0  # writer: frames published through this handle
+        self._slot = -1
+        self.torn = 0  # reader: frames overwritten while held
+
+    @property
+    def name(self):
+        return self._block.name
+
+    @property
+    def newest(self):
+        """Number of the newest published frame, or -1."""
+        latest = int(self.control[LATEST])
+        return latest // self.slots if latest >= 0 else -1
+
+    def publish(self, sim_time, angle, positions, steps=0):
+        """Writer: store a frame in a free slot and make it the newest; returns its number."""
+        control, slots = self.control, self.slots
+        latest = int(control[LATEST])
+        busy = (int(control[READING]), latest % slots if latest >= 0 else -1)
+        k = self._slot
+        while True:
+            k = (k + 1) % slots
+            if k not in busy:
+                break
+        number = self.published
+        self.sequence[k] = 2 * number + 1
+        self.time[k] = sim_time
+        self.angle[k] = angle
+        self.steps[k] = steps
+        self.positions[k] = positions
+        self.sequence[k] = 2 * number + 2
+        control[LATEST] = number * slots + k
+        self.published = number + 1
+        self._slot = k
+        return number
+
+    def acquire(self, after=-1):
+        """
+        Reader: hold the newest complete frame if it is newer than frame
+        number 'after'; returns a :class:`Frame`, or None.
+        """
+        control = self.control
+        for _ in range(self.slots):
+            latest = int(control[LATEST])
+            if latest < 0:
+                return None
+            number, k = divmod(latest, self.slots)
+            if number <= after:
+                return None
+            control[READING] = k
+            if self.sequence[k] == 2 * number + 2:
+                return Frame(number, k, float(self.time[k]), float(self.angle[k]), int(self.steps[k]),
+                             self.positions[k])
+        control[READING] = -1
+        return None
+
+    def release(self, frame):
+        """Reader: let the writer have the frame's slot again; False if it was overwritten while held."""
+        intact = self.sequence[frame.slot] == 2 * frame.number + 2
+        self.control[READING] = -1
+        if not intact:
+            self.torn += 1
+        return bool(intact)
+
+    def stop(self):
+        """Ask the writer to finish."""
+        self.control[STOP] = 1
+
+    @property
+    def stopping(self):
+        return bool(self.control[STOP])
+
+    def close(self):
+        self.control = self.sequence = self.time = self.angle = self.steps = self.positions = None
+        self._block.close()
+        if self.owner:
+            self._block.unlink()
+
+
+def build(spec):
+    """
+    The simulation described by 'spec': ``("engine", name, settings)`` for
+    :func:`~hexsim.engine.create`, or ``("batched", balls, seed)`` for
+    :meth:`~hexsim.batched.BatchedSimulation.random`.
+    """
+    kind, *args = spec
+    if kind == "engine":
+        from .engine import create
+
+        name, settings = args
+        return create(name, **settings)
+    from .batched import BatchedSimulation
+
+    balls, seed = args
+    return BatchedSimulation.random(balls, seed=seed)
+
+
+def positions(sim):
+    """The ball positions of an engine or batched simulation, as an (N, 2) array-like."""
+    pos = getattr(sim, "pos", None)
+    return ((sim.x, sim.y),) if pos is None else pos
+
+
+def simulate(ring_name, balls, slots, spec, physics_hz, max_steps=8, limit=None):
+    """
+    Simulation process: step the simulation built from 'spec' in real time
+    at 'physics_hz', publishing after every batch of steps, until the ring
+    is stopped (or after 'limit' steps, if given).
+    """
+    ring = FrameRing(balls, slots, name=ring_name)
+    try:
+        sim = build(spec)
+        timestep = FixedTimestep(1.0 / physics_hz, max_steps)
+        dt = timestep.dt
+        done = 0
+        ring.publish(sim.time, sim.angle, positions(sim), done)
+        last = time.perf_counter()
+        while not ring.stopping and (limit is None or done < limit):
+            now = time.perf_counter()
+            steps = timestep.advance(now - last)
+            last = now
+            if limit is not None:
+                steps = min(steps, limit - done)
+            if not steps:
+                time.sleep(dt - timestep.accumulator)
+                continue
+            sim.run(steps, dt)
+            done += steps
+            ring.publish(sim.time, sim.angle, positions(sim), done)
+    finally:
+        ring.close()
+
+
+class SplitSimulation:
+    """
+    Runs the simulation of 'spec' (see :func:`build`) in its own process,
+    publishing to a :class:`FrameRing` this side reads.  Use as a context
+    manager, or call :meth:`close`.
+    """
+
+    def __init__(self, spec, physics_hz=240, max_steps=8, slots=3, limit=None):
+        self.spec = spec
+        self.sim = build(spec)  # this side's copy, for the geometry
+        self.ring = FrameRing(np.shape(positions(self.sim))[0], slots)
+        self.process = mp.Process(target=simulate, daemon=True,
+                                  args=(self.ring.name, self.ring.balls, slots, spec, physics_hz, max_steps, limit))
+        self.process.start()
+
+    def close(self):
+        if self.ring is None:
+            return
+        self.ring.stop()
+        self.process.join(timeout=5)
+        self.ring.close()
+        self.ring = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def show(ring, after, draw):
+    """
+    Hold the newest frame of 'ring' newer than frame number 'after', call
+    'draw(frame)' on it and release it.  Returns the frame, or None if
+    there is none.  A frame overwritten while it was drawn is discarded and
+    the next newest drawn over it, so the frame returned is always intact;
+    its positions must not be read once it is returned.
+    """
+    while True:
+        frame = ring.acquire(after)
+        if frame is None:
+            return None
+        draw(frame)
+        if ring.release(frame):
+            return frame
+
+
+def window(spec, renderer="full", fps=60, physics_hz=240, max_steps=8, slots=3):
+    """Show the simulation of 'spec' stepped in a separate process, until the window is closed."""
+    import pygame
+
+    from .render import RENDERERS
+    from .scene import HEIGHT, WIDTH
+
+    with SplitSimulation(spec, physics_hz, max_steps, slots) as split:
+        sim, ring = split.sim, split.ring
+        center = tuple(sim.center) if hasattr(sim, "center") else (sim.cx, sim.cy)
+        outline = {}
+        if getattr(sim, "container", None) is not None:
+            outline = {"loops": sim.container.loops}
+            if renderer == "dirty":
+                outline.update(angle_steps=360, cache_size=360)
+        pygame.display.init()
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        clock = pygame.time.Clock()
+        view = RENDERERS[renderer](screen, center, sim.hex_radius, sim.ball_radius, sim.sides, **outline)
+
+        shown, frames, start = -1, 0, time.perf_counter()
+        steps = 0
+        dirty = []  # rects painted since the last present, torn frames' included
+
+        def paint(frame):
+            dirty.extend(view.paint(frame.angle, frame.positions) or ())
+
+        running = True
+        while running:
+            clock.tick(fps)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+            frame = show(ring, shown, paint)
+            if frame is None:
+                continue
+            shown, steps = frame.number, frame.steps
+            view.present(dirty)
+            dirty.clear()
+            frames += 1
+            if frames % fps == 0:
+                elapsed = time.perf_counter() - start
+                pygame.display.set_caption(f"Ball Bouncing in a Spinning Hexagon (split, {renderer} renderer): "
+                                           f"physics {steps / elapsed:,.0f} Hz, {frames / elapsed:.0f} fps")
+        pygame.quit()
+        elapsed = time.perf_counter() - start
+        print(f"split: {steps} physics steps ({steps / elapsed:,.0f} Hz) and {frames} frames "
+              f"({frames / elapsed:.0f} fps) in {elapsed:.1f} s; {ring.newest + 1} frames published, "
+              f"{ring.torn} torn")
+
+
+def _render_load(frame_index, fps, flip_ms, stall_ms, stall_every):
+    """The demo's stand-in for drawing and flipping: a sleep, with a long one every 'stall_every' seconds."""
+    stall = stall_every > 0 and frame_index % max(1, round(stall_every * fps)) == 0 and frame_index
+    time.sleep((stall_ms if stall else flip_ms) / 1000)
+
+
+def demo_inline(spec, seconds, fps, physics_hz, max_steps, flip_ms, stall_ms, stall_every):
+    """The viewer's single loop: physics catches up by the frame's wall time, then the frame is drawn."""
+    sim = build(spec)
+    timestep = FixedTimestep(1.0 / physics_hz, max_steps)
+    frames = 0
+    start = last = time.perf_counter()
+    while last - start < seconds:
+        now = time.perf_counter()
+        sim.run(timestep.advance(now - last), timestep.dt)
+        last = now
+        _render_load(frames, fps, flip_ms, stall_ms, stall_every)
+        frames += 1
+    return {"steps": sim.steps, "frames": frames, "elapsed": time.perf_counter() - start,
+            "dropped_s": timestep.dropped, "torn": 0}
+
+
+def demo_split(spec, seconds, fps, physics_hz, max_steps, flip_ms, stall_ms, stall_every, slots=3):
+    """The same load with physics in its own process, drawing whatever frame is newest."""
+    with SplitSimulation(spec, physics_hz, max_steps, slots) as split:
+        ring = split.ring
+        shown, frames, steps, skipped = -1, 0, 0, 0
+        start = time.perf_counter()
+
+        def draw(frame):
+            frame.positions.sum()  # read the frame, as drawing would
+            _render_load(frames, fps, flip_ms, stall_ms, stall_every)
+
+        while time.perf_counter() - start < seconds:
+            frame = show(ring, shown, draw)
+            if frame is None:
+                time.sleep(0.0005)
+                continue
+            skipped += frame.number - shown - 1
+            shown, steps = frame.number, frame.steps
+            frames += 1
+        elapsed = time.perf_counter() - start
+        torn = ring.torn
+    return {"steps": steps, "frames": frames, "elapsed": elapsed, "skipped": skipped, "torn": torn}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.split",
+                                     description="Run physics and rendering in separate processes.")
+    source = argparse.ArgumentParser(add_help=False)
+    source.add_argument("--impl", default="o3-mini-high", help="engine implementation (single ball)")
+    source.add_argument("--balls", type=int, help="run a batched o3-mini-high simulation of this many balls instead")
+    source.add_argument("--seed", type=int, default=0)
+    source.add_argument("--fps", type=int, default=60)
+    source.add_argument("--physics-hz", type=float, default=240)
+    source.add_argument("--max-catch-up", type=int, default=8, help="cap on physics steps per batch")
+    source.add_argument("--slots", type=int, default=3)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    window_parser = commands.add_parser("window", parents=[source], help="show it in a pygame window")
+    window_parser.add_argument("--renderer", choices=["full", "dirty", "bulk"], default="full")
+
+    demo_parser = commands.add_parser("demo", parents=[source],
+                                      help="headless: a slow, stalling renderer with and without the split")
+    demo_parser.add_argument("--seconds", type=float, default=5.0)
+    demo_parser.add_argument("--flip-ms", type=float, default=8.0, help="time spent drawing each frame")
+    demo_parser.add_argument("--stall-ms", type=float, default=250.0, help="length of an occasional long frame")
+    demo_parser.add_argument("--stall-every", type=float, default=1.0, help="seconds between long frames (0: none)")
+
+    args = parser.parse_args(argv)
+    spec = ("batched", args.balls, args.seed) if args.balls else ("engine", args.impl, {})
+    if args.command == "window":
+        window(spec, args.renderer, args.fps, args.physics_hz, args.max_catch_up, args.slots)
+        return 0
+
+    load = (args.seconds, args.fps, args.physics_hz, args.max_catch_up, args.flip_ms, args.stall_ms, args.stall_every)
+    inline = demo_inline(spec, *load)
+    split = demo_split(spec, *load, slots=args.slots)
+    print(f"target {args.physics_hz:g} Hz physics; drawing takes {args.flip_ms:g} ms, "
+          f"with a {args.stall_ms:g} ms stall every {args.stall_every:g} s")
+    print(f"{'mode':<8}{'physics Hz':>12}{'sim s lost':>12}{'fps':>7}{'skipped':>9}{'torn':>6}")
+    for mode, row in (("inline", inline), ("split", split)):
+        rate = row["steps"] / row["elapsed"]
+        lost = row["elapsed"] - row["steps"] / args.physics_hz
+        print(f"{mode:<8}{rate:>12,.0f}{lost:>12.2f}{row['frames'] / row['elapsed']:>7.0f}"
+              f"{row.get('skipped', 0):>9}{row['torn']:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
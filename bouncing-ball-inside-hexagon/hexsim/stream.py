@@ -0,0 +1,373 @@
+"""
+Stream one authoritative simulation to any number of viewers over TCP or a
+Unix socket.
+
+    python -m hexsim.stream serve --balls 500 --port 8765
+    python -m hexsim.stream view --port 8765
+    python -m hexsim.stream demo --clients 8 --slow 2 --seconds 8
+
+The server runs a headless :class:`~hexsim.batched.BatchedSimulation` and
+broadcasts a snapshot per tick: the polygon angle and the ball positions in
+fixed point (1/``SCALE`` pixel).  Frames are length-prefixed messages of
+kind ``KEY`` (absolute int32 coordinates) or ``DELTA`` (int16 change since
+the previous frame, half the size).  Each frame is encoded once per tick
+and shared by every client; keyframes are only encoded on ticks where some
+client needs one.
+
+Every client has a single slot holding the newest frame not yet handed to
+its socket, emptied by its own writer task.  A frame still waiting when the
+next tick arrives is replaced rather than queued behind, so a slow viewer
+never stalls the simulation or the other viewers and never works through a
+backlog of stale frames.  A client that missed a frame can no longer apply
+deltas, so the replacement is a keyframe.  New clients start on a keyframe,
+and one is sent to everybody every 'keyframe_interval' ticks.
+"""
+import argparse
+import asyncio
+import socket
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from .batched import BatchedSimulation
+
+SCALE = 64  # fixed-point units per pixel
+KEY, DELTA = 0, 1
+LENGTH = struct.Struct("<I")
+# kind, frame number, simulated time, polygon angle, ball count
+FRAME = struct.Struct("<BIddI")
+# center x, center y, polygon radius, ball radius, sides: sent once on connect
+HELLO = struct.Struct("<ddddI")
+
+
+def encode(kind, frame, sim_time, angle, values):
+    payload = FRAME.pack(kind, frame, sim_time, angle, len(values) // 2) + values.tobytes()
+    return LENGTH.pack(len(payload)) + payload
+
+
+class _Client:
+    __slots__ = ("writer", "pending", "ready", "needs_key", "sent", "dropped", "task")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.pending = None  # the newest frame not yet written
+        self.ready = asyncio.Event()
+        self.needs_key = True
+        self.sent = 0
+        self.dropped = 0
+        self.task = None
+
+
+class StateServer:
+    """
+    Steps 'sim' 'substeps' times per tick at 'fps' ticks per second and
+    broadcasts every tick to the connected clients.
+
+    A frame is only written once the kernel has taken everything before it,
+    so the server holds at most one waiting frame per client plus a kernel
+    send buffer of 'write_buffer' bytes (which Linux doubles).  Whatever the
+    receiving side buffers comes on top; see :meth:`StateClient.connect`.
+    Buffered frames are bytes, not time: a client reading at a third of the
+    tick rate takes three ticks over each, so its lag is about three times
+    the frames in flight (around 35 ticks in the demo).
+    """
+
+    def __init__(self, sim, fps=60, substeps=4, keyframe_interval=120, history=600, write_buffer=4 * 1024):
+        self.sim = sim
+        self.write_buffer = write_buffer
+        self.fps = fps
+        self.substeps = substeps
+        self.keyframe_interval = keyframe_interval
+        self.clients = []
+        self.frame = 0
+        self.ticks_late = 0
+        # CRC of recent frames' coordinates, so clients' reconstructions can be checked.
+        self.checksums = {}
+        self._history = history
+        self._previous = None
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8765, path=None):
+        """Listen on TCP, or on the Unix socket 'path' if given."""
+        if path:
+            self._server = await asyncio.start_unix_server(self._accept, path=path)
+        else:
+            self._server = await asyncio.start_server(self._accept, host, port)
+        return self._server
+
+    async def _accept(self, reader, writer):
+        sim = self.sim
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.write_buffer)
+        # drain() then waits until the kernel has taken the whole frame.
+        writer.transport.set_write_buffer_limits(high=0)
+        writer.write(HELLO.pack(*sim.center, sim.hex_radius, sim.ball_radius, sim.sides))
+        client = _Client(writer)
+        client.task = asyncio.create_task(self._send(client))
+        self.clients.append(client)
+
+    async def _send(self, client):
+        try:
+            while True:
+                await client.ready.wait()
+                client.ready.clear()
+                message, client.pending = client.pending, None
+                client.writer.write(message)
+                client.sent += 1
+                await client.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            if client in self.clients:
+                self.clients.remove(client)
+            client.writer.close()
+
+    def quantized(self):
+        return np.round(self.sim.pos * SCALE).astype(np.int32).ravel()
+
+    def broadcast(self):
+        """Encode the current state and hand it to every client, replacing any frame still waiting."""
+        sim = self.sim
+        current = self.quantized()
+        frame = self.frame
+        self.checksums[frame] = zlib.crc32(current.tobytes())
+        self.checksums.pop(frame - self._history, None)
+
+        delta = None
+        if self._previous is not None and frame % self.keyframe_interval:
+            change = current - self._previous
+            if np.abs(change).max(initial=0) <= np.iinfo(np.int16).max:
+                delta = encode(DELTA, frame, sim.time, sim.angle, change.astype(np.int16))
+        key = None
+        for client in self.clients:
+            if client.pending is not None:
+                client.dropped += 1
+                client.needs_key = True
+            if delta is None or client.needs_key:
+                if key is None:
+                    key = encode(KEY, frame, sim.time, sim.angle, current)
+                client.pending = key
+                client.needs_key = False
+            else:
+                client.pending = delta
+            client.ready.set()
+        self._previous = current
+        self.frame += 1
+
+    async def run(self, seconds=None):
+        """Tick in real time until cancelled, or for 'seconds'."""
+        sim = self.sim
+        period = 1.0 / self.fps
+        dt = period / self.substeps
+        loop = asyncio.get_running_loop()
+        start = next_tick = loop.time()
+        while seconds is None or next_tick - start < seconds:
+            sim.run(self.substeps, dt)
+            self.broadcast()
+            next_tick += period
+            delay = next_tick - loop.time()
+            if delay < 0:
+                self.ticks_late += 1
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def close(self):
+        for client in list(self.clients):
+            client.task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class StateClient:
+    """Receives frames and rebuilds the ball positions (in pixels)."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.center = self.hex_radius = self.ball_radius = self.sides = None
+        self.frame = None
+        self.time = 0.0
+        self.angle = 0.0
+        self.coordinates = None  # int32 fixed point, as sent
+        self.received = 0
+        self.keyframes = 0
+        self.skipped = 0  # frames missing between consecutive deliveries
+        self.bytes = 0
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765, path=None, buffer=None):
+        """
+        Connect; 'buffer' caps the bytes buffered on this side (default: the OS's).
+
+        The kernel receive buffer has to be sized before connecting, while
+        the window is negotiated, so the socket is made here rather than
+        left to asyncio.
+        """
+        kwargs = {}
+        if buffer:
+            sock = socket.socket(socket.AF_UNIX if path else socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, buffer)
+            sock.setblocking(False)
+            await asyncio.get_running_loop().sock_connect(sock, path or (host, port))
+            kwargs = {"sock": sock, "limit": buffer}
+        if path:
+            reader, writer = await asyncio.open_unix_connection(None if buffer else path, **kwargs)
+        else:
+            reader, writer = await asyncio.open_connection(*((None, None) if buffer else (host, port)), **kwargs)
+        client = cls(reader, writer)
+        cx, cy, client.hex_radius, client.ball_radius, client.sides = HELLO.unpack(
+            await reader.readexactly(HELLO.size))
+        client.center = (cx, cy)
+        return client
+
+    @property
+    def positions(self):
+        return self.coordinates.reshape(-1, 2) / SCALE
+
+    async def receive(self):
+        """Read and apply the next frame; returns its number, or None when the server is gone."""
+        try:
+            (length,) = LENGTH.unpack(await self.reader.readexactly(LENGTH.size))
+            payload = await self.reader.readexactly(length)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+        kind, frame, self.time, self.angle, count = FRAME.unpack_from(payload)
+        if kind == KEY:
+            self.coordinates = np.frombuffer(payload, np.int32, 2 * count, FRAME.size).copy()
+            self.keyframes += 1
+        else:
+            if self.frame is None or frame != self.frame + 1:
+                raise ValueError(f"delta frame {frame} does not follow frame {self.frame}")
+            self.coordinates += np.frombuffer(payload, np.int16, 2 * count, FRAME.size)
+        if self.frame is not None and frame > self.frame + 1:
+            self.skipped += frame - self.frame - 1
+        self.frame = frame
+        self.received += 1
+        self.bytes += LENGTH.size + length
+        return frame
+
+    def checksum(self):
+        return zlib.crc32(self.coordinates.tobytes())
+
+    def close(self):
+        self.writer.close()
+
+
+async def _fake_client(port, path, seconds, delay, server, report):
+    client = await StateClient.connect(port=port, path=path, buffer=4 * 1024)
+    mismatches = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if await client.receive() is None:
+            break
+        expected = server.checksums.get(client.frame)
+        if expected is not None and expected != client.checksum():
+            mismatches += 1
+        lag = server.frame - 1 - client.frame
+        report["max_lag"] = max(report.get("max_lag", 0), lag)
+        if delay:
+            await asyncio.sleep(delay)
+    client.close()
+    report.update(received=client.received, keyframes=client.keyframes, skipped=client.skipped,
+                  bytes=client.bytes, mismatches=mismatches)
+
+
+async def demo(balls, clients, slow, seconds, fps, port, path=None):
+    """A server plus 'clients' fake viewers on localhost, 'slow' of which read at a third of the rate."""
+    sim = BatchedSimulation.random(balls, seed=1)
+    server = StateServer(sim, fps=fps)
+    await server.start(port=port, path=path)
+    reports = [{} for _ in range(clients)]
+    tasks = [asyncio.create_task(_fake_client(port, path, seconds, 3.0 / fps if k < slow else 0.0,
+                                              server, reports[k]))
+             for k in range(clients)]
+    await asyncio.sleep(0.1)
+    await server.run(seconds + 0.5)
+    await asyncio.gather(*tasks)
+    await server.close()
+    print(f"server: {server.frame} frames at {fps} Hz, {balls} balls, {server.ticks_late} late ticks")
+    for k, report in enumerate(reports):
+        kind = "slow" if k < slow else "fast"
+        print(f"  client {k} ({kind}): {report['received']:>5} frames, {report['keyframes']:>4} keyframes, "
+              f"{report['skipped']:>5} dropped, {report['bytes'] / max(report['received'], 1):>7.0f} B/frame, "
+              f"max lag {report.get('max_lag', 0)}, {report['mismatches']} mismatches")
+    return reports
+
+
+async def view(port, path=None, renderer="full"):
+    """A pygame window showing a stream."""
+    import pygame
+
+    from .render import RENDERERS
+    from .scene import HEIGHT, WIDTH
+
+    client = await StateClient.connect(port=port, path=path)
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Ball Bouncing in a Spinning Hexagon (stream)")
+    display = RENDERERS[renderer](screen, client.center, client.hex_radius, client.ball_radius, client.sides)
+    running = True
+    while running and await client.receive() is not None:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        positions = client.positions
+        display.draw(client.angle, positions if renderer == "bulk" else positions.tolist())
+    client.close()
+    pygame.quit()
+
+
+async def serve(balls, fps, port, path=None, seed=None):
+    server = StateServer(BatchedSimulation.random(balls, seed=seed), fps=fps)
+    await server.start(port=port, path=path)
+    print(f"serving {balls} balls at {fps} Hz on {path or f'127.0.0.1:{port}'}")
+    try:
+        await server.run()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.stream",
+                                     description="Broadcast one simulation to many viewers.")
+    address = argparse.ArgumentParser(add_help=False)
+    address.add_argument("--port", type=int, default=8765)
+    address.add_argument("--unix", metavar="PATH", help="use a Unix socket instead of TCP")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", parents=[address], help="run the simulation and stream it")
+    serve_parser.add_argument("--balls", type=int, default=100)
+    serve_parser.add_argument("--fps", type=int, default=60)
+    serve_parser.add_argument("--seed", type=int)
+
+    view_parser = commands.add_parser("view", parents=[address], help="show a stream in a window")
+    view_parser.add_argument("--renderer", choices=["full", "dirty", "bulk"], default="full",
+                             help="use bulk for thousands of balls")
+
+    demo_parser = commands.add_parser("demo", parents=[address], help="server plus fake clients on localhost")
+    demo_parser.add_argument("--balls", type=int, default=500)
+    demo_parser.add_argument("--clients", type=int, default=8)
+    demo_parser.add_argument("--slow", type=int, default=2, help="how many clients read at a third of the rate")
+    demo_parser.add_argument("--seconds", type=float, default=8.0)
+    demo_parser.add_argument("--fps", type=int, default=60)
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "serve":
+            asyncio.run(serve(args.balls, args.fps, args.port, args.unix, args.seed))
+        elif args.command == "view":
+            asyncio.run(view(args.port, args.unix, args.renderer))
+        else:
+            asyncio.run(demo(args.balls, args.clients, args.slow, args.seconds, args.fps, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
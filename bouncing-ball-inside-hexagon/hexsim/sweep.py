@@ -0,0 +1,168 @@
+"""
+Parameter sweeps over the physics constants, one headless run per point.
+
+    python -m hexsim.sweep --impl o3-mini-high \
+        --grid restitution=0.5:0.95:10 --grid friction_coeff=0,0.1,0.3 \
+        --steps 100000 --out sweep.csv
+
+    python -m hexsim.sweep --impl o1 --sample 500 \
+        --range bounce_friction=0.5:1.0 --range rotation_speed=0:180
+
+Parameters are the lower-cased script globals listed in each
+implementation's ``PARAMS`` (e.g. ``restitution``, ``friction_coeff``,
+``angular_velocity`` and ``gravity`` for o3-mini-high).  Runs are independent,
+so they are fanned out over a process pool in chunks and only the per-run
+metrics travel back; the table is written in sweep order.
+"""
+import argparse
+import csv
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import IMPLEMENTATIONS, Simulation, create
+
+
+def parse_grid(spec):
+    """
+    Parse ``name=start:stop:count`` (inclusive, evenly spaced) or
+    ``name=v1,v2,...`` into ``(name, [values])``.
+    """
+    name, _, values = spec.partition("=")
+    if not values:
+        raise ValueError(f"expected name=values, got {spec!r}")
+    if ":" in values:
+        start, stop, count = values.split(":")
+        start, stop, count = float(start), float(stop), int(count)
+        if count < 2:
+            return name, [start]
+        return name, [start + (stop - start) * k / (count - 1) for k in range(count)]
+    return name, [float(v) for v in values.split(",")]
+
+
+def parse_range(spec):
+    """Parse ``name=low:high`` into ``(name, low, high)``."""
+    name, _, values = spec.partition("=")
+    low, _, high = values.partition(":")
+    if not high:
+        raise ValueError(f"expected name=low:high, got {spec!r}")
+    return name, float(low), float(high)
+
+
+def grid_points(axes):
+    """Cartesian product of ``[(name, values), ...]`` as a list of dicts."""
+    names = [name for name, _ in axes]
+    return [dict(zip(names, combo)) for combo in itertools.product(*(values for _, values in axes))]
+
+
+def sample_points(ranges, count, seed=None):
+    """'count' points drawn uniformly from ``[(name, low, high), ...]``."""
+    rng = random.Random(seed)
+    return [{name: rng.uniform(low, high) for name, low, high in ranges} for _ in range(count)]
+
+
+def run_one(job):
+    """
+    Run one headless simulation and return its metrics.
+
+    'job' is ``(impl, params, steps, dt, collision)``.  Module-level so it
+    pickles for the process pool.
+    """
+    impl, params, steps, dt, collision = job
+    sim = create(impl, collision=collision, **params)
+    step = sim.step
+    is_outside = sim.is_outside
+
+    escapes = 0
+    was_outside = False
+    energy_sum = 0.0
+    for _ in range(steps):
+        step(dt)
+        energy_sum += sim.energy()
+        outside = is_outside()
+        if outside and not was_outside:
+            escapes += 1
+        was_outside = outside
+
+    return {
+        **params,
+        "escapes": escapes,
+        "ended_outside": was_outside,
+        "mean_energy": energy_sum / steps if steps else sim.energy(),
+        "bounces": sim.bounces,
+    }
+
+
+def sweep(impl, points, steps, dt, workers=None, chunksize=None, collision="discrete"):
+    """Run every parameter point in 'points' and return the metric rows in order."""
+    jobs = [(impl, point, steps, dt, collision) for point in points]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [run_one(job) for job in jobs]
+    # A few chunks per worker keeps the pool busy without per-run round trips.
+    chunksize = chunksize or max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_one, jobs, chunksize=chunksize))
+
+
+def write_table(rows, stream):
+    if not rows:
+        return
+    writer = csv.DictWriter(stream, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hexsim.sweep",
+                                     description="Sweep physics constants over parallel headless runs.")
+    parser.add_argument("--impl", choices=sorted(IMPLEMENTATIONS), default="o3-mini-high")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=START:STOP:COUNT|V1,V2",
+                        help="grid axis; repeat for a Cartesian product")
+    parser.add_argument("--range", action="append", default=[], metavar="NAME=LOW:HIGH",
+                        help="axis for --sample; repeat for more parameters")
+    parser.add_argument("--sample", type=int, help="draw this many random points from the --range axes")
+    parser.add_argument("--seed", type=int, default=0, help="seed for --sample")
+    parser.add_argument("--steps", type=int, default=60 * 60)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--collision", choices=list(Simulation.COLLISION_MODES), default="discrete")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--out", help="CSV file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.sample is not None:
+            if args.grid or not args.range:
+                parser.error("--sample takes --range axes and no --grid")
+            points = sample_points([parse_range(spec) for spec in args.range], args.sample, args.seed)
+        else:
+            if args.range or not args.grid:
+                parser.error("give --grid axes, or --sample with --range axes")
+            points = grid_points([parse_grid(spec) for spec in args.grid])
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    known = IMPLEMENTATIONS[args.impl].PARAMS
+    unknown = sorted({name for point in points for name in point} - set(known))
+    if unknown:
+        parser.error(f"{args.impl} has no parameter {', '.join(unknown)}; choose from {', '.join(known)}")
+
+    start = time.perf_counter()
+    rows = sweep(args.impl, points, args.steps, args.dt, args.workers, collision=args.collision)
+    elapsed = time.perf_counter() - start
+
+    if args.out:
+        with open(args.out, "w", newline="") as f:
+            write_table(rows, f)
+    else:
+        write_table(rows, sys.stdout)
+    print(f"{len(rows)} runs x {args.steps} steps in {elapsed:.2f} s "
+          f"({len(rows) * args.steps / elapsed:,.0f} steps/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+"""
+Fixed-timestep accumulator: physics at a fixed rate, rendering at whatever
+rate the display manages.
+
+Each frame's wall-clock time is added to an accumulator, which is then
+spent in whole physics steps of ``dt``.  At most 'max_steps' are taken per
+frame; beyond that the backlog is dropped (the simulation runs slow for a
+moment) instead of spiraling into ever longer frames.  What is left over is
+less than one step, and ``alpha`` (leftover / dt) says how far the displayed
+state should be interpolated from the previous physics state towards the
+current one.
+
+The results of a run therefore only depend on ``dt``, not on frame rate or
+machine load, and a stalled frame costs a few more steps instead of one
+huge step that tunnels through a wall.
+"""
+import math
+
+
+class FixedTimestep:
+    """Accumulator for fixed physics steps of 'dt' seconds."""
+
+    def __init__(self, dt, max_steps=8):
+        if dt <= 0 or max_steps < 1:
+            raise ValueError("dt must be > 0 and max_steps >= 1")
+        self.dt = dt
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0  # seconds of backlog discarded by the catch-up cap
+
+    def advance(self, elapsed):
+        """Add 'elapsed' wall-clock seconds; returns how many steps to take now."""
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            excess = (steps - self.max_steps) * self.dt
+            self.dropped += excess
+            self.accumulator -= excess
+            steps = self.max_steps
+        self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        """Interpolation factor in [0, 1) between the previous and current state."""
+        return min(max(self.accumulator / self.dt, 0.0), 1.0)
+
+
+def lerp(a, b, alpha):
+    return a + (b - a) * alpha
+
+
+def lerp_angle(a, b, alpha):
+    """Interpolate along the shorter way round, so wrapped angles don't spin back."""
+    delta = (b - a + math.pi) % (2 * math.pi) - math.pi
+    return a + delta * alpha
+
+
+def snapshot(sim):
+    """The state the renderer needs: (angle, x, y)."""
+    return sim.angle, sim.x, sim.y
+
+
+def interpolate(previous, current, alpha):
+    """Blend two :func:`snapshot` states; returns (angle, [(x, y)])."""
+    angle0, x0, y0 = previous
+    angle1, x1, y1 = current
+    return lerp_angle(angle0, angle1, alpha), [(lerp(x0, x1, alpha), lerp(y0, y1, alpha))]
@@ -0,0 +1,143 @@
+"""
+Interactive pygame window for the engine's implementations.
+
+    python -m hexsim --impl o3-mini-high --renderer dirty
+
+Unlike the scripts, the physics comes from :mod:`hexsim.engine` and drawing
+goes through one of the renderers in :mod:`hexsim.render`.  Physics also
+runs at a fixed rate decoupled from the frame rate (see
+:mod:`hexsim.timestep`), and each frame shows the state interpolated between
+the last two physics steps.
+"""
+import pygame
+
+from .profiler import FrameProfiler
+from .render import RENDERERS
+from .scene import HEIGHT, WIDTH
+from .timestep import FixedTimestep, interpolate, snapshot
+
+
+def run(sim, renderer="full", fps=60, record=None, profile_trace=None, physics_hz=240, max_steps=8):
+    """
+    Show 'sim' in a window until it is closed, recording every step to the
+    trajectory file 'record' if given.  F3 toggles the frame-timing HUD and
+    'profile_trace' names a Chrome trace file written on exit.
+
+    Physics advances in fixed steps of 1/'physics_hz' seconds, at most
+    'max_steps' per frame.  A 'physics_hz' of 0 steps once per frame by the
+    frame time instead, as the scripts do.
+    """
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(f"Ball Bouncing in a Spinning Hexagon ({sim.name}, {renderer} renderer)")
+    clock = pygame.time.Clock()
+    outline = {}
+    if sim.container is not None:
+        outline["loops"] = sim.container.loops
+        if renderer == "dirty":
+            # No rotational symmetry: spread the outline sprites over the full turn.
+            outline.update(angle_steps=360, cache_size=360)
+    view = RENDERERS[renderer](screen, (sim.cx, sim.cy), sim.hex_radius, sim.ball_radius, sim.sides, **outline)
+    writer = None
+    if record:
+        from .recording import TrajectoryWriter
+
+        writer = TrajectoryWriter(record, sim, 1.0 / (physics_hz or fps))
+        writer.record()
+    profiler = FrameProfiler(trace_path=profile_trace)
+    timestep = FixedTimestep(1.0 / physics_hz, max_steps) if physics_hz else None
+    previous = current = snapshot(sim)
+
+    running = True
+    while running:
+        profiler.start_frame()
+        dt = clock.tick(fps) / 1000.0
+        profiler.lap("tick")
+
+        for event in pygame.event.get():
+            profiler.handle_event(event)
+            if event.type == pygame.QUIT:
+                running = False
+        profiler.lap("events")
+
+        if timestep is None:
+            collided = sim.step(dt)
+            if writer is not None:
+                writer.record(collided)
+            angle, balls = sim.angle, [(sim.x, sim.y)]
+        else:
+            for _ in range(timestep.advance(dt)):
+                previous = current
+                collided = sim.step(timestep.dt)
+                if writer is not None:
+                    writer.record(collided)
+                current = snapshot(sim)
+            angle, balls = interpolate(previous, current, timestep.alpha)
+        profiler.lap("physics")
+
+        dirty = view.paint(angle, balls)
+        hud = profiler.hud_surface()
+        if hud is not None:
+            view.overlay(hud, (8, 8))
+        profiler.lap("draw")
+        view.present(dirty)
+        profiler.lap("flip")
+
+    if writer is not None:
+        writer.close()
+    profiler.close()
+    pygame.quit()
+
+
+def replay(trajectory, start=0, speed=1.0, renderer="full", fps=60):
+    """
+    Play a recorded :class:`~hexsim.recording.Trajectory` back without running
+    any physics.  Space pauses, Left/Right seek one second, Home restarts.
+    """
+    pygame.display.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    clock = pygame.time.Clock()
+    view = RENDERERS[renderer](screen, trajectory.center, trajectory.hex_radius, trajectory.ball_radius,
+                               trajectory.sides)
+    records = trajectory.records
+    last = len(records) - 1
+    if last < 0:
+        pygame.quit()
+        return
+    t = float(records["time"][min(max(start, 0), last)])
+    end = float(records["time"][last])
+    paused = False
+
+    running = True
+    while running:
+        dt = clock.tick(fps) / 1000.0
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_RIGHT:
+                    t += 1.0
+                elif event.key == pygame.K_LEFT:
+                    t -= 1.0
+                elif event.key == pygame.K_HOME:
+                    t = float(records["time"][0])
+
+        if not paused:
+            t += dt * speed
+        t = min(max(t, float(records["time"][0])), end)
+        index = trajectory.index_at(t)
+        record = records[index]
+        following = records[min(index + 1, last)]
+        # Blend towards the next record, so playback is smooth at any frame rate.
+        span = float(following["time"] - record["time"])
+        alpha = (t - float(record["time"])) / span if span > 0 else 0.0
+        pygame.display.set_caption(f"Replay {trajectory.name}: step {index}/{last}  t={record['time']:.2f} s"
+                                   f"{'  (paused)' if paused else ''}")
+        view.draw(*interpolate((float(record["angle"]), float(record["x"]), float(record["y"])),
+                               (float(following["angle"]), float(following["x"]), float(following["y"])),
+                               min(max(alpha, 0.0), 1.0)))
+
+    pygame.quit()
@@ -1,8 +1,15 @@
-import pygame
 import math
 import sys
 
-pygame.init()
+# Headless mode: run the same physics with no window or frame limiter (see hexsim/).
+if "--headless" in sys.argv[1:]:
+    from hexsim.cli import main as run_headless
+    sys.exit(run_headless(["--impl", "o1"] + sys.argv[1:]))
+
+import pygame
+from hexsim.profiler import FrameProfiler  # F3 toggles the timing HUD; --profile-trace PATH saves a trace
+
+pygame.display.init()
 
 # ---------------------------
 #  Basic settings
@@ -111,14 +118,19 @@ def line_normal(p1, p2):
 #  Main game loop
 # ---------------------------
 
+profiler = FrameProfiler.from_argv(sys.argv[1:])
 running = True
 while running:
+    profiler.start_frame()
     dt = clock.tick(60) / 1000.0  # dt in seconds
+    profiler.lap("tick")
 
     # Event handling
     for event in pygame.event.get():
+        profiler.handle_event(event)
         if event.type == pygame.QUIT:
             running = False
+    profiler.lap("events")
 
     # Update hexagon rotation
     current_angle += rotation_speed * dt
@@ -135,6 +147,7 @@ while running:
     # Update position
     ball_position[0] += ball_velocity[0] * dt
     ball_position[1] += ball_velocity[1] * dt
+    profiler.lap("physics")
 
     # Get current hexagon vertices
     hex_vertices = get_hexagon_vertices(hex_center[0], hex_center[1],
@@ -183,6 +196,7 @@ while running:
                 # Apply bounce friction
                 ball_velocity[0] *= bounce_friction
                 ball_velocity[1] *= bounce_friction
+    profiler.lap("collision")
 
     # ---------------------------
     #  Rendering
@@ -196,9 +210,13 @@ while running:
     pygame.draw.circle(screen, (255, 100, 100),
                        (int(ball_position[0]), int(ball_position[1])),
                        ball_radius)
+    profiler.draw_hud(screen)
+    profiler.lap("draw")
 
     # Flip the display
     pygame.display.flip()
+    profiler.lap("flip")
 
+profiler.close()
 pygame.quit()
 sys.exit()
@@ -1,9 +1,16 @@
 import math
-import pygame
 import sys
 
+# Headless mode: run the same physics with no window or frame limiter (see hexsim/).
+if "--headless" in sys.argv[1:]:
+    from hexsim.cli import main as run_headless
+    sys.exit(run_headless(["--impl", "o3-mini"] + sys.argv[1:]))
+
+import pygame
+from hexsim.profiler import FrameProfiler  # F3 toggles the timing HUD; --profile-trace PATH saves a trace
+
 # Initialize pygame
-pygame.init()
+pygame.display.init()
 
 # Screen settings
 WIDTH, HEIGHT = 800, 600
@@ -120,14 +127,19 @@ def handle_collisions(ball_pos, ball_vel, vertices):
 def main():
     global ball_pos, ball_vel, hex_rotation
 
+    profiler = FrameProfiler.from_argv(sys.argv[1:])
     running = True
     while running:
+        profiler.start_frame()
         dt = clock.tick(60) / 1000.0  # Delta time in seconds.
+        profiler.lap("tick")
 
         # Process events
         for event in pygame.event.get():
+            profiler.handle_event(event)
             if event.type == pygame.QUIT:
                 running = False
+        profiler.lap("events")
 
         # Update hexagon rotation.
         hex_rotation += hex_angular_speed * dt
@@ -141,12 +153,14 @@ def main():
 
         # Apply damping (simulate friction/air resistance).
         ball_vel *= velocity_damping
+        profiler.lap("physics")
 
         # Get current hexagon vertices.
         vertices = get_hexagon_vertices(hex_center, hex_radius, hex_rotation, num_sides)
 
         # Handle collisions with the hexagon walls.
         ball_pos, ball_vel = handle_collisions(ball_pos, ball_vel, vertices)
+        profiler.lap("collision")
 
         # Clear the screen.
         screen.fill(BLACK)
@@ -156,10 +170,14 @@ def main():
 
         # Draw the ball.
         pygame.draw.circle(screen, BALL_COLOR, (int(ball_pos.x), int(ball_pos.y)), ball_radius)
+        profiler.draw_hud(screen)
+        profiler.lap("draw")
 
         # Update display.
         pygame.display.flip()
+        profiler.lap("flip")
 
+    profiler.close()
     pygame.quit()
     sys.exit()
 
@@ -1,7 +1,14 @@
-import pygame
 import math
 import sys
 
+# Headless mode: run the same physics with no window or frame limiter (see hexsim/).
+if "--headless" in sys.argv[1:]:
+    from hexsim.cli import main as run_headless
+    sys.exit(run_headless(["--impl", "o3-mini-high"] + sys.argv[1:]))
+
+import pygame
+from hexsim.profiler import FrameProfiler  # F3 toggles the timing HUD; --profile-trace PATH saves a trace
+
 # --- Constants ---
 WIDTH, HEIGHT = 800, 600
 FPS = 60
@@ -109,27 +116,33 @@ def collide_ball_with_segment(ball, A, B, hex_center, angular_velocity):
 
 
 def main():
-    pygame.init()
+    pygame.display.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Ball Bouncing in a Spinning Hexagon")
     clock = pygame.time.Clock()
 
     hex_angle = 0.0  # initial rotation angle of the hexagon (radians)
 
+    profiler = FrameProfiler.from_argv(sys.argv[1:])
     running = True
     while running:
+        profiler.start_frame()
         dt = clock.tick(FPS) / 1000.0  # dt in seconds
+        profiler.lap("tick")
 
         # --- Event Handling ---
         for event in pygame.event.get():
+            profiler.handle_event(event)
             if event.type == pygame.QUIT:
                 running = False
+        profiler.lap("events")
 
         # --- Update Physics ---
         # Gravity affects the vertical velocity.
         ball['vel'].y += GRAVITY * dt
         # Update ball position based on its velocity.
         ball['pos'] += ball['vel'] * dt
+        profiler.lap("physics")
 
         # Update the hexagon’s rotation.
         hex_angle += HEXAGON_ANGULAR_VELOCITY * dt
@@ -140,6 +153,7 @@ def main():
             A = vertices[i]
             B = vertices[(i + 1) % len(vertices)]
             collide_ball_with_segment(ball, A, B, HEXAGON_CENTER, HEXAGON_ANGULAR_VELOCITY)
+        profiler.lap("collision")
 
         # --- Drawing ---
         screen.fill((30, 30, 30))  # dark background
@@ -152,9 +166,13 @@ def main():
         pygame.draw.circle(
             screen, (255, 100, 100), (int(ball['pos'].x), int(ball['pos'].y)), ball['radius']
         )
+        profiler.draw_hud(screen)
+        profiler.lap("draw")
 
         pygame.display.flip()
+        profiler.lap("flip")
 
+    profiler.close()
     pygame.quit()
     sys.exit()
 
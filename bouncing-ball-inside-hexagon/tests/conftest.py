@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-golden", action="store_true",
+                     help="rewrite tests/golden/ from the current engine instead of comparing against it")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "timing: per-step time budgets (deselect with -m 'not timing')")
+    config.step_timings = {}
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    timings = config.step_timings
+    if not timings:
+        return
+    terminalreporter.section("per-step time (best batch) vs budget")
+    for (impl, mode), (measured, budget) in sorted(timings.items()):
+        terminalreporter.write_line(f"{impl:<14}{mode:<10}{measured:>8.2f} us  budget {budget:>7.2f} us  "
+                                    f"({measured / budget:.0%})")
+
+
+@pytest.fixture
+def update_golden(request):
+    return request.config.getoption("--update-golden")
+
+
+@pytest.fixture
+def step_timings(request):
+    return request.config.step_timings
+
+
+@pytest.fixture(scope="session")
+def budget_scale():
+    """Multiplier for the time budgets, e.g. ``HEXSIM_BUDGET_SCALE=3`` on a slow CI runner."""
+    return float(os.environ.get("HEXSIM_BUDGET_SCALE", "1"))
@@ -0,0 +1,26 @@
+"""The scalar o3-mini-high step allocates nothing in steady state and matches the "local" mode exactly."""
+import pytest
+
+from hexsim.engine import create
+from hexsim.scalar import ScalarO3MiniHigh, transient_bytes
+
+from .scenarios import DT, SEEDS, initial_state, label
+
+
+@pytest.mark.parametrize("seed", SEEDS, ids=label)
+def test_scalar_step_allocates_nothing(seed):
+    sim = ScalarO3MiniHigh(create("o3-mini-high", **initial_state("o3-mini-high", seed)))
+    sim.run(1000, DT)
+    bounces = sim.bounces
+    held, peak = transient_bytes(sim.step, DT, 5000)
+    assert sim.bounces > bounces, "the measured steps should include wall contacts"
+    assert (held, peak) == (0, 0), f"{held} bytes held, {peak} bytes peak over 5000 steps"
+
+
+@pytest.mark.parametrize("seed", SEEDS, ids=label)
+def test_scalar_matches_local_mode(seed):
+    local = create("o3-mini-high", collision="local", **initial_state("o3-mini-high", seed))
+    scalar = ScalarO3MiniHigh(local)
+    for _ in range(3600):
+        assert scalar.step(DT) == local.step(DT)
+    assert scalar.snapshot() == local.snapshot()
@@ -0,0 +1,74 @@
+"""Streaming analytics count every sample and bounce, leave the physics alone and stay fixed in size."""
+import math
+
+import pytest
+
+from hexsim.analytics import Analytics
+from hexsim.container import MeshContainer, gear
+from hexsim.engine import create
+
+from .scenarios import DT, IMPLS, MODES
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("impl", IMPLS)
+def test_counts_match_simulation(impl, mode):
+    plain = create(impl, collision=mode).run(3000, DT)
+    sim = create(impl, collision=mode)
+    stats = Analytics(sim, buffer=100)  # small buffer: exercise many flushes
+    stats.run(3000, DT)
+
+    assert sim.snapshot() == plain.snapshot()
+    snap = stats.snapshot()
+    assert snap["samples"] == 3000
+    assert snap["world"].sum() + snap["outside"] == 3000
+    assert snap["rotating"].sum() <= 3000
+    assert snap["speed"].sum() == 3000
+    assert snap["impacts"].sum() == sim.bounces
+    assert snap["impulse"].sum() == snap["impacts"].sum()
+
+
+def test_kernel_modes_agree_on_edges():
+    edges = []
+    for mode in ("discrete", "local", "sector"):
+        stats = Analytics(create("o3-mini-high", collision=mode)).run(600, DT)
+        edges.append(stats.snapshot()["impacts"].tolist())
+    assert edges[0] == edges[1] == edges[2]
+
+
+def test_container_impacts_go_to_the_nearest_edge():
+    part = MeshContainer(gear(teeth=30, samples=2, pins=3))
+    sim = create("o3-mini-high", collision="sector", container=part)
+    stats = Analytics(sim, buffer=50)
+    expected = [0] * len(part.edges)
+    for _ in range(1200):
+        bounces = sim.bounces
+        sim.step(DT)
+        stats.sample()
+        if sim.bounces > bounces:
+            dx, dy = sim.x - sim.cx, sim.y - sim.cy
+            c, s = math.cos(sim.angle), math.sin(sim.angle)
+            lx, ly = c * dx + s * dy, c * dy - s * dx
+
+            def distance(edge):
+                ax, ay, abx, aby, inv_length_sq = edge[:5]
+                t = min(1.0, max(0.0, ((lx - ax) * abx + (ly - ay) * aby) * inv_length_sq))
+                return math.hypot(lx - ax - t * abx, ly - ay - t * aby)
+
+            nearest = min(range(len(part.edges)), key=lambda k: distance(part.edges[k]))
+            assert distance(part.edges[nearest]) <= sim.ball_radius + 1e-6
+            expected[nearest] += sim.bounces - bounces
+    assert sum(expected) > 0
+    assert stats.snapshot()["impacts"].tolist() == expected
+
+
+def test_detach_restores_respond():
+    sim = create("o3-mini-high")
+    Analytics(sim).detach()
+    assert "respond" not in vars(sim)
+
+
+def test_summary_without_samples():
+    summary = Analytics(create("o3-mini-high")).summary()
+    assert summary["samples"] == 0
+    assert summary["speed_p50"] is None and summary["speed_p99"] is None
@@ -0,0 +1,97 @@
+"""Mesh containers: file round trip, edge orientation, a complete grid matching the full scan, and no escapes."""
+import math
+import pickle
+import random
+
+import pytest
+
+from hexsim.container import MeshContainer, gear, read_outline, write_outline
+from hexsim.engine import create
+
+from .scenarios import DT, IMPLS
+
+
+@pytest.fixture(scope="module")
+def part():
+    return MeshContainer(gear(teeth=90, samples=3))
+
+
+def test_outline_round_trip(tmp_path):
+    loops = gear(teeth=8, samples=2, pins=2)
+    path = tmp_path / "part.txt"
+    write_outline(path, loops)
+    assert read_outline(path) == loops
+
+    path.write_text("# square, closed, with commas\n0,0\n10,0\n10,10\n0,10\n0,0\n\n\n2 2\n4 2\n3 4\n")
+    assert read_outline(path) == [[(0, 0), (10, 0), (10, 10), (0, 10)], [(2, 2), (4, 2), (3, 4)]]
+
+
+def test_normals_point_into_the_solid(part):
+    for ax, ay, abx, aby, _, nx, ny, _ in part.edges:
+        mx, my = ax + 0.5 * abx, ay + 0.5 * aby
+        assert part.contains(mx - 1e-3 * nx, my - 1e-3 * ny)
+        assert not part.contains(mx + 1e-3 * nx, my + 1e-3 * ny)
+
+
+def test_grid_cell_holds_every_edge_within_margin(part):
+    rng = random.Random(0)
+    for _ in range(2000):
+        x, y = rng.uniform(-260, 260), rng.uniform(-260, 260)
+        near = set(part.nearby(x, y))
+        for edge in part.edges:
+            ax, ay, abx, aby, inv_length_sq = edge[:5]
+            t = min(1.0, max(0.0, ((x - ax) * abx + (y - ay) * aby) * inv_length_sq))
+            if math.hypot(x - ax - t * abx, y - ay - t * aby) < part.margin:
+                assert edge in near
+
+
+@pytest.mark.parametrize("impl", IMPLS)
+def test_grid_matches_full_scan_and_keeps_the_ball_inside(impl, part):
+    scan = create(impl, collision="local", container=part)
+    grid = create(impl, collision="sector", container=part)
+    for _ in range(1200):
+        assert grid.step(DT) == scan.step(DT)
+        assert not grid.is_outside()
+    assert grid.snapshot() == scan.snapshot()
+    assert grid.bounces > 0
+
+
+def test_edgeless_cells_know_which_side_they_are_on(part):
+    rng = random.Random(1)
+    for _ in range(2000):
+        x, y = rng.uniform(-260, 260), rng.uniform(-260, 260)
+        k = int((x - part.x0) * part.inv_cell) * part.rows + int((y - part.y0) * part.inv_cell)
+        if not part.cells[k]:
+            assert part.buried[k] == (not part.contains(x, y))
+
+
+@pytest.mark.parametrize("dt", [1 / 30, 1 / 15])
+@pytest.mark.parametrize("impl", IMPLS)
+def test_coarse_steps_do_not_let_the_ball_escape(impl, dt):
+    sim = create(impl, collision="sector", container=MeshContainer(gear()))
+    for _ in range(3000):
+        sim.step(dt)
+        assert not sim.is_outside()
+
+
+@pytest.mark.parametrize("mode", ["local", "sector"])
+def test_ball_inside_the_solid_is_pushed_back_out(mode, part):
+    # Beyond the outer wall and the grid around it, so no cell lists its edges.
+    sim = create("deep-seek-r1", collision=mode, container=part, pos=(400.0 + 280.0, 300.0), vel=(0.0, 0.0))
+    assert sim.is_outside()
+    sim.step(DT)
+    assert not sim.is_outside()
+
+
+def test_container_survives_pickling(part):
+    sim = create("o3-mini-high", collision="sector", container=part).run(300, DT)
+    copy = create(sim.name, **pickle.loads(pickle.dumps(sim.settings()))).restore(sim.snapshot())
+    assert copy.container.edges == part.edges
+    assert copy.run(300, DT).snapshot() == sim.run(300, DT).snapshot()
+
+
+def test_container_needs_rotating_frame_mode_and_margin(part):
+    with pytest.raises(ValueError, match="container"):
+        create("o1", collision="discrete", container=part)
+    with pytest.raises(ValueError, match="radius"):
+        create("o1", collision="sector", container=part, ball_radius=part.margin + 1)
@@ -0,0 +1,116 @@
+"""
+Golden trajectories: every implementation in every collision mode, run from
+the fixed starts in :mod:`tests.scenarios`, must reproduce the samples stored
+in ``tests/golden/<impl>.json``.
+
+The faster collision modes are also held to ``"discrete"`` directly, with
+tolerances that allow for rounding only, so a change of physics cannot be
+recorded as a new golden file by mistake.
+
+After an intended change in behavior, regenerate them with
+``python -m pytest tests/test_golden.py --update-golden`` and review the diff.
+"""
+import json
+import math
+import os
+
+import pytest
+
+from hexsim.engine import create
+
+from .scenarios import DT, IMPLS, MODES, SEEDS, initial_state, label
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+STEPS = 600
+EVERY = 30
+FIELDS = ("time", "angle", "x", "y", "vx", "vy")
+REL_TOL = 1e-9
+ABS_TOL = 1e-6  # pixels (and radians, seconds)
+
+
+def trace(impl, mode, seed):
+    sim = create(impl, collision=mode, **initial_state(impl, seed))
+    samples = []
+    for k in range(1, STEPS + 1):
+        sim.step(DT)
+        if k % EVERY == 0:
+            samples.append([sim.time, sim.angle, sim.x, sim.y, sim.vx, sim.vy])
+    return {"bounces": sim.bounces, "samples": samples}
+
+
+def golden_path(impl):
+    return os.path.join(GOLDEN_DIR, f"{impl}.json")
+
+
+def load_golden(impl):
+    with open(golden_path(impl)) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("impl", IMPLS)
+def test_golden_trajectories(impl, update_golden):
+    runs = {f"{mode}/{label(seed)}": trace(impl, mode, seed) for mode in MODES for seed in SEEDS}
+    if update_golden:
+        with open(golden_path(impl), "w") as f:
+            json.dump({"dt": DT, "steps": STEPS, "every": EVERY, "fields": FIELDS, "runs": runs}, f, indent=1)
+            f.write("\n")
+        pytest.skip("golden file rewritten")
+
+    golden = load_golden(impl)
+    assert (golden["dt"], golden["steps"], golden["every"]) == (DT, STEPS, EVERY), "stale golden file"
+    assert sorted(golden["runs"]) == sorted(runs)
+    for key, run in runs.items():
+        expected = golden["runs"][key]
+        for got, want in zip(run["samples"], expected["samples"]):
+            for field, a, b in zip(FIELDS, got, want):
+                assert math.isclose(a, b, rel_tol=REL_TOL, abs_tol=ABS_TOL), \
+                    f"{impl} {key}: {field} at t={want[0]:.3f} is {a!r}, golden {b!r}"
+        assert len(run["samples"]) == len(expected["samples"])
+        assert run["bounces"] == expected["bounces"], f"{impl} {key}: bounce count changed"
+
+
+@pytest.mark.parametrize("impl", IMPLS)
+@pytest.mark.parametrize("seed", SEEDS, ids=label)
+def test_sector_matches_local(impl, seed):
+    """The sector lookup must be a pure speedup: step for step the same as testing every edge."""
+    local = create(impl, collision="local", **initial_state(impl, seed))
+    sector = create(impl, collision="sector", **initial_state(impl, seed))
+    for _ in range(STEPS):
+        assert local.step(DT) == sector.step(DT)
+        assert (sector.x, sector.y, sector.vx, sector.vy) == (local.x, local.y, local.vx, local.vy)
+
+
+def assert_same_state(sim, reference, where):
+    for field in ("x", "y", "vx", "vy"):
+        a, b = getattr(sim, field), getattr(reference, field)
+        assert math.isclose(a, b, rel_tol=REL_TOL, abs_tol=ABS_TOL), f"{where}: {field} is {a!r}, discrete {b!r}"
+
+
+@pytest.mark.parametrize("mode", ["local", "sector"])
+@pytest.mark.parametrize("impl", IMPLS)
+@pytest.mark.parametrize("seed", SEEDS, ids=label)
+def test_kernel_modes_match_discrete(impl, mode, seed):
+    """The cached kernel applies each script's own contact test: the same run up to rounding."""
+    discrete = create(impl, **initial_state(impl, seed))
+    sim = create(impl, collision=mode, **initial_state(impl, seed))
+    for k in range(STEPS):
+        assert sim.step(DT) == discrete.step(DT), f"{impl} {mode}: contact differs at step {k}"
+        assert_same_state(sim, discrete, f"{impl} {mode} step {k}")
+    assert sim.bounces == discrete.bounces
+
+
+@pytest.mark.parametrize("impl", IMPLS)
+@pytest.mark.parametrize("seed", SEEDS, ids=label)
+def test_swept_matches_discrete_until_first_contact(impl, seed):
+    """
+    Swept mode resolves contacts at the time of impact rather than after the
+    step, so it is held to the script's run up to rounding only until the
+    first contact (DeepSeek's script starts the ball touching the top edge).
+    """
+    discrete = create(impl, **initial_state(impl, seed))
+    swept = create(impl, collision="swept", **initial_state(impl, seed))
+    flight = 0
+    while not (discrete.step(DT) | swept.step(DT)):
+        assert_same_state(swept, discrete, f"{impl} swept step {flight}")
+        flight += 1
+    assert flight > 30 or (impl, seed) == ("deep-seek-r1", None)
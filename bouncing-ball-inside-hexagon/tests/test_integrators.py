@@ -0,0 +1,50 @@
+"""The integrators converge at their order against exact free flight, and are only offered where they apply."""
+import math
+
+import pytest
+
+from hexsim.benchmarks.integrators import exact_flight, sweep
+from hexsim.engine import create
+
+from .scenarios import IMPLS
+
+ORDERS = {"euler": 1, "verlet": 2, "rk4": 4}
+
+
+def flight_error(impl, integrator, dt, seconds=1.0):
+    sim = create(impl, collision="local", integrator=integrator, hex_radius=1e9)
+    x, y, _, _ = exact_flight(sim, seconds)
+    sim.run(round(seconds / dt), dt)
+    return math.hypot(sim.x - x, sim.y - y)
+
+
+@pytest.mark.parametrize("integrator", ORDERS)
+@pytest.mark.parametrize("impl", IMPLS)
+def test_error_shrinks_at_integrator_order(impl, integrator):
+    coarse, fine = flight_error(impl, integrator, 1 / 15), flight_error(impl, integrator, 1 / 30)
+    if coarse < 1e-9:
+        return  # gravity alone gives a parabola, which Verlet and RK4 integrate exactly
+    assert math.log2(coarse / fine) == pytest.approx(ORDERS[integrator], abs=0.3)
+
+
+@pytest.mark.parametrize("mode", ["local", "sector"])
+def test_higher_order_integrators_keep_the_ball_inside(mode):
+    for integrator in ORDERS:
+        sim = create("deep-seek-r1", collision=mode, integrator=integrator)
+        for _ in range(3600):
+            sim.step(1 / 60)
+            assert not sim.is_outside()
+
+
+def test_integrator_needs_rotating_frame_mode():
+    with pytest.raises(ValueError, match="integrator"):
+        create("o1", collision="discrete", integrator="rk4")
+    with pytest.raises(ValueError, match="unknown integrator"):
+        create("o1", collision="local", integrator="leapfrog")
+
+
+def test_bounce_scenario_needs_a_bounce():
+    with pytest.raises(ValueError, match="does not bounce"):
+        sweep("deep-seek-r1", "bounce", ["rk4"], (1 / 60,), seconds=1.0)
+    rows = sweep("deep-seek-r1", "bounce", ["rk4"], (1 / 60,), seconds=2.0)
+    assert len(rows) == 1 and rows[0]["position"] > 0
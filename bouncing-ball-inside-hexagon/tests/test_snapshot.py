@@ -0,0 +1,35 @@
+"""Snapshots restore exactly, and forked branches match running each branch by hand."""
+import pickle
+
+import pytest
+
+from hexsim.engine import create
+from hexsim.ensemble import fork, perturb
+
+from .scenarios import DT, IMPLS, MODES
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("impl", IMPLS)
+def test_restore_continues_exactly(impl, mode):
+    straight = create(impl, collision=mode).run(300, DT)
+    state = straight.snapshot()
+    straight.run(300, DT)
+
+    resumed = create(impl, collision=mode).restore(pickle.loads(pickle.dumps(state)))
+    resumed.run(300, DT)
+    assert resumed.snapshot() == straight.snapshot()
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_fork_matches_sequential_branches(executor):
+    sim = create("o3-mini-high").run(600, DT)
+    before = sim.snapshot()
+    branches = fork(sim, 4, 120, DT, position=1e-3, seed=7, every=60, workers=2, executor=executor)
+    assert sim.snapshot() == before
+
+    for start, samples in zip(perturb(before, 4, position=1e-3, seed=7), branches):
+        assert len(samples) == 2
+        branch = create("o3-mini-high").restore(start)
+        assert branch.run(60, DT).snapshot() == samples[0]
+        assert branch.run(60, DT).snapshot() == samples[1]
@@ -0,0 +1,83 @@
+"""The shared-memory frame ring hands over the newest complete frame, and split runs match running in-process."""
+import time
+
+import numpy as np
+import pytest
+
+from hexsim.engine import create
+from hexsim.split import READING, FrameRing, SplitSimulation, show
+
+
+@pytest.fixture
+def ring():
+    ring = FrameRing(balls=2, slots=3)
+    yield ring
+    ring.close()
+
+
+def test_reader_gets_newest_frame_without_copying(ring):
+    assert ring.acquire() is None
+    for n in range(5):
+        ring.publish(n * 0.1, n, [(n, n), (-n, -n)], steps=n)
+    frame = ring.acquire()
+    assert (frame.number, frame.steps, frame.angle) == (4, 4, 4.0)
+    assert np.shares_memory(frame.positions, ring.positions)
+    assert frame.positions.tolist() == [[4.0, 4.0], [-4.0, -4.0]]
+    assert ring.release(frame)
+    assert ring.acquire(after=4) is None
+
+
+def test_writer_never_overwrites_the_held_frame(ring):
+    ring.publish(0.0, 0.0, [(1, 1), (1, 1)])
+    frame = ring.acquire()
+    for n in range(1, 20):
+        ring.publish(n, n, [(n, n), (n, n)])
+    assert frame.positions.tolist() == [[1.0, 1.0], [1.0, 1.0]]
+    assert ring.release(frame)
+    assert ring.acquire().number == 19
+
+
+def test_overwritten_frame_is_reported_torn(ring):
+    ring.publish(0.0, 0.0, [(0, 0), (0, 0)])
+    frame = ring.acquire()
+    ring.control[READING] = -1  # as if the writer picked the slot before the claim was visible
+    for n in range(1, 4):
+        ring.publish(n, n, [(n, n), (n, n)])
+    assert not ring.release(frame)
+    assert ring.torn == 1
+
+
+def test_show_draws_the_next_frame_over_a_torn_one(ring):
+    ring.publish(0.0, 0.0, [(0, 0), (0, 0)])
+    drawn = []
+
+    def draw(frame):
+        drawn.append(frame.number)
+        if len(drawn) == 1:
+            ring.control[READING] = -1
+            for n in range(1, 4):
+                ring.publish(n, n, [(n, n), (n, n)])
+
+    frame = show(ring, -1, draw)
+    assert drawn == [0, 3] and frame.number == 3 and ring.torn == 1
+    assert show(ring, frame.number, draw) is None
+
+
+def test_split_process_matches_in_process_run():
+    dt = 1 / 2000
+    with SplitSimulation(("engine", "o3-mini-high", {}), physics_hz=2000, limit=400) as split:
+        deadline = time.perf_counter() + 10
+        frame = None
+        while time.perf_counter() < deadline:
+            frame = split.ring.acquire()
+            if frame is not None and frame.steps == 400:
+                break
+            if frame is not None:
+                split.ring.release(frame)
+            time.sleep(0.01)
+        assert frame is not None and frame.steps == 400
+        x, y = frame.positions[0]
+        split.ring.release(frame)
+
+    sim = create("o3-mini-high").run(400, dt)
+    assert (x, y) == (sim.x, sim.y)
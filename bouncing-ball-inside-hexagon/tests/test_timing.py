@@ -0,0 +1,56 @@
+"""
+Per-step time budgets.
+
+Each budget is several times the best-batch time measured when it was
+set, so it only trips on a real regression; ``HEXSIM_BUDGET_SCALE`` scales
+them all for slower machines, and ``-m "not timing"`` skips them.  The
+measured times are printed at the end of the run.  After an optimization,
+lower the budget to lock the gain in.  The machine-independent check that
+the cached-kernel modes beat the script's own discrete test holds anywhere.
+"""
+import time
+
+import pytest
+
+from hexsim.engine import create
+
+from .scenarios import DT, IMPLS
+
+# Microseconds per step, from the script's own initial state.
+BUDGETS_US = {
+    "deep-seek-r1": {"discrete": 100, "swept": 60, "local": 10, "sector": 10},
+    "o1": {"discrete": 60, "swept": 70, "local": 20, "sector": 15},
+    "o3-mini": {"discrete": 50, "swept": 45, "local": 8, "sector": 6},
+    "o3-mini-high": {"discrete": 50, "swept": 30, "local": 8, "sector": 7},
+}
+BATCH = 2000
+REPEATS = 5
+
+
+def step_time_us(impl, mode):
+    """Best of REPEATS batches of BATCH steps, in microseconds per step."""
+    sim = create(impl, collision=mode)
+    sim.run(BATCH, DT)  # warm up
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        sim.run(BATCH, DT)
+        best = min(best, time.perf_counter() - start)
+    return best / BATCH * 1e6
+
+
+@pytest.mark.timing
+@pytest.mark.parametrize("impl,mode", [(impl, mode) for impl in IMPLS for mode in BUDGETS_US[impl]])
+def test_step_budget(impl, mode, budget_scale, step_timings):
+    budget = BUDGETS_US[impl][mode] * budget_scale
+    measured = step_time_us(impl, mode)
+    step_timings[impl, mode] = (measured, budget)
+    assert measured <= budget, f"{impl} {mode}: {measured:.2f} us/step exceeds the {budget:.2f} us budget"
+
+
+@pytest.mark.timing
+@pytest.mark.parametrize("impl", IMPLS)
+def test_kernel_modes_beat_discrete(impl):
+    discrete = step_time_us(impl, "discrete")
+    for mode in ("local", "sector"):
+        assert step_time_us(impl, mode) < discrete, f"{impl}: {mode} is no faster than discrete"